@@ -0,0 +1,470 @@
+from math import sqrt
+
+import numpy as np
+
+from history import History
+from monitor import DivergenceMonitor, MAX_ITERATIONS, STALL_WINDOW
+from permutation import ROW_BLOCK, find_dominant_permutation
+from preprocess_cache import matrix_fingerprint
+
+
+MODES = ("jacobi", "seidel", "sor")  # Режимы шага: Якоби, Гаусс-Зейдель, верхняя релаксация
+PROBE_SWEEPS = 8  # Число пробных шагов Якоби для автоматического подбора ω
+POWER_STEPS = 20  # Число шагов степенного метода для оценки спектрального радиуса
+
+
+def relaxation_from_probe(norms):
+    """
+    Подбор параметра релаксации ω по нормам приращений пробных шагов Якоби.
+    Скорость убывания приращений оценивает спектральный радиус ρ матрицы Якоби,
+    по нему ω = 2 / (1 + sqrt(1 - ρ²)) (формула Юнга).
+    :param norms: Нормы приращений на последовательных шагах Якоби.
+    :return: Параметр релаксации (1, если оценить ρ < 1 не удалось).
+    """
+    norms = [value for value in norms if value > 0]
+    if len(norms) < 2:
+        return 1.0
+
+    rho = (norms[-1] / norms[0]) ** (1 / (len(norms) - 1))
+    if rho >= 1:
+        return 1.0
+    return 2 / (1 + sqrt(1 - rho ** 2))
+
+
+class ArrayIterativeMethod:
+    supports_multiple_rhs = True  # Вектор b может быть матрицей из нескольких правых частей
+    accepts_sparse = False  # Можно ли передавать разреженную матрицу (файлы .mtx)
+    sweep_modes = MODES  # Доступные режимы шага
+    uses_cache = True  # Можно ли передать кэш подготовки матриц
+
+    def __init__(self, matrix, vector_b, tolerance, mode="jacobi", omega=None, history=None, cache=None):
+        """
+        Метод простых итераций на массивах NumPy (float64).
+        Матрица не копируется: перестановка строк и масштабирование хранятся отдельно,
+        а сама матрица используется только для умножения на вектор.
+        :param matrix: Матрица коэффициентов системы (список списков или ndarray).
+        :param vector_b: Вектор свободных членов или матрица n×m из m правых частей (по столбцам).
+        :param tolerance: Точность решения.
+        :param mode: Режим шага: "jacobi", "seidel" или "sor".
+        :param omega: Параметр релаксации для "sor" (None - подобрать автоматически).
+        :param history: Политика хранения истории итераций (по умолчанию хранится вся история).
+        :param cache: Кэш подготовки матриц (PreprocessCache) или None.
+        """
+        self.matrix = self.as_matrix(matrix)
+        self.vector_b = np.array(vector_b, dtype=np.float64)
+        self.tolerance = tolerance
+        self.n = self.matrix.shape[0]  # Размерность системы
+        self.mode = mode
+        self.omega = 1.0 if mode == "seidel" else omega
+        self.history = history if history is not None else History()
+        self.cache = cache
+        self.fingerprint = None  # Хэш матрицы, под которым ее подготовка хранится в кэше
+
+        self.permutation = np.arange(self.n)  # Порядок строк исходной матрицы
+        self.row_scales = np.ones(self.n)  # Множители строк после масштабирования
+        self.diagonal = None  # Диагональ переставленной и отмасштабированной матрицы
+        self.dominant = None  # Достигнуто ли строгое диагональное преобладание
+        self.spectral_radius = None  # Оценка спектрального радиуса матрицы метода Якоби
+        self.b_scale = 1.0  # Делитель вектора b (по столбцам): решение исходной системы - x * b_scale
+        self.stall_window = STALL_WINDOW  # Окно контроля расходимости
+        self.max_iterations = MAX_ITERATIONS  # Предельное число итераций
+        self.diverged = False  # Были ли итерации прерваны из-за расходимости
+
+    @staticmethod
+    def as_matrix(matrix):
+        """
+        Приведение матрицы к формату, с которым работает реализация (без копирования ndarray).
+        """
+        return np.asarray(matrix, dtype=np.float64)
+
+    def row_blocks(self):
+        """
+        Разбиение строк на блоки, чтобы не создавать временных массивов размера n×n.
+        """
+        for start in range(0, self.n, ROW_BLOCK):
+            yield start, min(start + ROW_BLOCK, self.n)
+
+    def row_abs_sums(self):
+        """
+        Суммы модулей элементов каждой строки исходной матрицы.
+        """
+        sums = np.empty(self.n)
+        for start, stop in self.row_blocks():
+            sums[start:stop] = np.abs(self.matrix[start:stop]).sum(axis=1)
+        return sums
+
+    def row_abs_max(self):
+        """
+        Максимальные по модулю элементы каждой строки исходной матрицы.
+        """
+        maxima = np.empty(self.n)
+        for start, stop in self.row_blocks():
+            maxima[start:stop] = np.abs(self.matrix[start:stop]).max(axis=1)
+        return maxima
+
+    def permuted_diagonal(self):
+        """
+        Диагональ матрицы с учетом текущей перестановки строк (без масштабирования).
+        """
+        return self.matrix[self.permutation, np.arange(self.n)]
+
+    def check_diagonal_dominance(self):
+        """
+        Проверка диагонального преобладания для текущего порядка строк.
+        """
+        diagonal = np.abs(self.permuted_diagonal())
+        row_sums = self.row_abs_sums()[self.permutation] - diagonal
+        return bool(np.all(diagonal > row_sums))
+
+    def make_diagonal_dominance(self):
+        """
+        Поиск перестановки строк для диагонального преобладания через задачу о назначениях.
+        :return: Достигнуто ли строгое диагональное преобладание.
+        """
+        permutation, dominant = find_dominant_permutation(self.matrix)
+        if permutation is not None:
+            self.permutation = permutation
+        return dominant
+
+    def scale_matrix_and_vector(self):
+        """
+        Масштабирование строк и вектора b. Матрица не изменяется: запоминаются только множители строк.
+        """
+        self.scale_matrix()
+        self.scale_vector()
+
+    def scale_matrix(self):
+        """
+        Множители строк и диагональ переставленной и отмасштабированной матрицы.
+        """
+        row_scales = self.row_abs_max()[self.permutation]
+        row_scales[row_scales == 0] = 1
+        self.row_scales = 1 / row_scales
+        self.diagonal = self.permuted_diagonal() * self.row_scales
+
+    def scale_vector(self):
+        """
+        Перестановка и масштабирование вектора b теми же множителями, что и строки матрицы.
+        """
+        # Для нескольких правых частей каждый столбец масштабируется независимо
+        max_b = np.max(np.abs(self.vector_b), axis=0)
+        max_b = np.where(max_b != 0, max_b, 1)
+
+        self.vector_b = self.vector_b[self.permutation] * self.rowwise(self.row_scales, self.vector_b)
+        self.vector_b = self.vector_b / max_b
+        self.b_scale = max_b
+
+    def norm(self, vector):
+        """
+        Вычисление нормы вектора (по методу максимума - L∞).
+        :param vector: Вектор для расчета нормы.
+        :return: Норма вектора.
+        """
+        return np.max(np.abs(vector))
+
+    @staticmethod
+    def rowwise(values, x):
+        """
+        Приведение построчных множителей к форме, подходящей для x (вектор или матрица n×m).
+        """
+        return values if x.ndim == 1 else values[:, None]
+
+    def matvec(self, x):
+        """
+        Произведение переставленной и отмасштабированной матрицы на вектор (или блок векторов) x.
+        """
+        return self.rowwise(self.row_scales, x) * (self.matrix @ x)[self.permutation]
+
+    def row_dot(self, row, x):
+        """
+        Скалярное произведение строки исходной матрицы на вектор x.
+        :param row: Номер строки в исходной матрице.
+        """
+        return self.matrix[row] @ x
+
+    def jacobi_delta(self, x, vector_b):
+        """
+        Приращение шага метода Якоби целиком на массивах.
+        (b - (A - D)x) / D - x = (b - Ax) / D, где диагональ D выделена заранее.
+        """
+        return (vector_b - self.matvec(x)) / self.rowwise(self.diagonal, x)
+
+    def sweep(self, x, vector_b=None):
+        """
+        Один шаг метода на месте, без копирования вектора x.
+        :param x: Текущее приближение (вектор или блок столбцов n×m), обновляется на месте.
+        :param vector_b: Правые части, соответствующие столбцам x (по умолчанию self.vector_b).
+        :return: Модули приращений компонент (погрешности шага).
+        """
+        if vector_b is None:
+            vector_b = self.vector_b
+
+        if self.mode == "jacobi":
+            delta = self.jacobi_delta(x, vector_b)
+            x += delta
+            return np.abs(delta)
+
+        # Гаусс-Зейдель и верхняя релаксация: новые компоненты сразу используются в следующих строках
+        omega = self.omega
+        errors = np.empty_like(x)
+        for i, row in enumerate(self.permutation):
+            delta = omega * (vector_b[i] - self.row_scales[i] * self.row_dot(row, x)) / self.diagonal[i]
+            x[i] += delta
+            errors[i] = np.abs(delta)
+        return errors
+
+    def tune_omega(self, probe_sweeps=PROBE_SWEEPS):
+        """
+        Автоматический подбор ω по нескольким пробным шагам Якоби из нулевого приближения.
+        """
+        x = np.zeros(self.vector_b.shape)
+        norms = []
+        for _ in range(probe_sweeps):
+            delta = self.jacobi_delta(x, self.vector_b)
+            x += delta
+            norms.append(self.norm(delta))
+        return relaxation_from_probe(norms)
+
+    def estimate_spectral_radius(self, steps=POWER_STEPS):
+        """
+        Оценка спектрального радиуса матрицы метода Якоби B = I - D⁻¹A степенным методом.
+        Используется среднее геометрическое коэффициентов роста нормы на второй половине шагов,
+        что устойчиво и для комплексных собственных значений.
+        :param steps: Число шагов степенного метода (по одному умножению на матрицу).
+        """
+        v = np.random.default_rng(0).standard_normal(self.n)
+        v /= self.norm(v)
+        growth = []
+        for _ in range(steps):
+            w = v - self.matvec(v) / self.diagonal
+            w_norm = self.norm(w)
+            if w_norm == 0:
+                return 0.0
+            growth.append(w_norm)
+            v = w / w_norm
+        return float(np.exp(np.mean(np.log(growth[steps // 2:]))))
+
+    def predict_iterations(self, rho):
+        """
+        Ожидаемое число итераций метода Якоби из нулевого приближения:
+        приращения убывают как ρ^k, первое приращение равно D⁻¹b.
+        :param rho: Оценка спектрального радиуса (< 1).
+        """
+        first = self.norm(self.vector_b / self.rowwise(self.diagonal, self.vector_b))
+        if first < self.tolerance:
+            return 1
+        if rho == 0:
+            return 2
+        return 1 + int(np.ceil(np.log(self.tolerance / first) / np.log(rho)))
+
+    def iterate(self):
+        """
+        Итерационный процесс в выбранном режиме.
+        Прерывается, если погрешность перестала уменьшаться (см. DivergenceMonitor).
+        :return: Найденное решение и число итераций (история передается в self.history).
+        """
+        if self.vector_b.ndim == 2:
+            return self.iterate_block()
+
+        x = np.zeros(self.n)
+        iterations = 0
+        monitor = DivergenceMonitor(self.stall_window, self.max_iterations)
+        self.diverged = False
+
+        while True:
+            iterations += 1
+            errors = self.sweep(x)
+            self.history.append(iterations, x, errors)
+
+            error = self.norm(errors)
+            if error < self.tolerance:
+                break
+            if monitor.stalled(iterations, error)[0]:
+                self.diverged = True
+                break
+
+        self.history.close()
+        return x, iterations
+
+    def iterate_block(self):
+        """
+        Совместные итерации для нескольких правых частей: один блочный шаг обновляет все
+        еще не сошедшиеся столбцы, у каждого столбца своя проверка сходимости,
+        сошедшиеся столбцы замораживаются и дальше не пересчитываются.
+        История итераций для блока не сохраняется.
+        :return: Матрица решений n×m и массив чисел итераций для каждого столбца.
+        """
+        x = np.zeros(self.vector_b.shape)
+        iterations = np.zeros(x.shape[1], dtype=int)
+        active = np.arange(x.shape[1])  # Номера еще не сошедшихся столбцов
+        monitor = DivergenceMonitor(self.stall_window, self.max_iterations, x.shape[1])
+        self.diverged = np.zeros(x.shape[1], dtype=bool)
+        sweeps = 0
+
+        while active.size:
+            sweeps += 1
+            if active.size == x.shape[1]:
+                errors = self.sweep(x)
+            else:
+                block = x[:, active]
+                errors = self.sweep(block, self.vector_b[:, active])
+                x[:, active] = block
+            iterations[active] += 1
+
+            norms = np.max(errors, axis=0)
+            converged = norms < self.tolerance
+            stalled = monitor.stalled(sweeps, norms, active) & ~converged
+            self.diverged[active[stalled]] = True
+            active = active[~(converged | stalled)]
+
+        self.history.close()
+        return x, iterations
+
+    def prepare(self):
+        """
+        Подготовка системы: перестановка строк и масштабирование.
+        Если задан кэш и эта матрица уже подготавливалась, перестановка и множители берутся из кэша.
+        :return: False, если на диагонали остались нули и итерации невозможны.
+        """
+        if not self.load_preparation():
+            self.dominant = self.check_diagonal_dominance() or self.make_diagonal_dominance()
+            self.scale_matrix()
+            self.store_preparation()
+
+        self.scale_vector()
+        if not np.all(self.diagonal != 0):
+            return False
+
+        if self.mode == "sor" and self.omega is None:
+            self.omega = self.tune_omega()
+        return True
+
+    def load_preparation(self):
+        """
+        Восстановление подготовки матрицы из кэша.
+        :return: Найдена ли матрица в кэше.
+        """
+        if self.cache is None:
+            return False
+        self.fingerprint = matrix_fingerprint(self.matrix)
+        entry = self.cache.get(self.fingerprint)
+        if entry is None:
+            return False
+
+        self.permutation = entry["permutation"]
+        self.row_scales = entry["row_scales"]
+        self.diagonal = entry["diagonal"]
+        self.dominant = entry["dominant"]
+        self.spectral_radius = entry["spectral_radius"]
+        return True
+
+    def store_preparation(self):
+        """
+        Сохранение подготовки матрицы в кэш.
+        """
+        if self.cache is None:
+            return
+        self.cache.put(self.fingerprint, {
+            "permutation": self.permutation,
+            "row_scales": self.row_scales,
+            "diagonal": self.diagonal,
+            "dominant": self.dominant,
+            "spectral_radius": self.spectral_radius,
+        })
+
+    def residuals(self, x):
+        """
+        Вектор невязки Ax - b для подготовленной системы.
+        """
+        return self.matvec(x) - self.vector_b
+
+    def precheck(self):
+        """
+        Проверки перед итерациями: преобладание и оценка спектрального радиуса.
+        :return: False, если итерации заведомо расходятся и запускать их бессмысленно.
+        """
+        if not self.dominant:
+            print("(!) Строгого диагонального преобладания нельзя достичь перестановкой строк, "
+                  "сходимость не гарантирована.")
+
+        if self.spectral_radius is None:
+            self.spectral_radius = self.estimate_spectral_radius()
+            self.store_preparation()
+        if self.spectral_radius >= 1:
+            print(f"(!) Оценка спектрального радиуса матрицы метода Якоби ρ ≈ {self.spectral_radius:.4f} >= 1, "
+                  f"метод Якоби расходится.")
+            if self.mode == "jacobi":
+                return False
+        else:
+            print(f"Оценка спектрального радиуса ρ ≈ {self.spectral_radius:.4f}, ожидаемое число итераций "
+                  f"метода Якоби: {self.predict_iterations(self.spectral_radius)}")
+        return True
+
+    def summary(self):
+        """
+        Строка с описанием выполненного метода для вывода результатов.
+        """
+        return f"Режим: {self.mode}, ω = {self.omega or 1.0:.4f}"
+
+    def solve(self):
+        """
+        Решение системы уравнений.
+        """
+        if not self.prepare():
+            print("(!) На диагонали матрицы остались нули, метод простых итераций неприменим.")
+            return None
+
+        if not self.precheck():
+            return None
+
+        solution, iterations = self.iterate()
+        if solution.ndim == 2:
+            if type(self.history) is not History:
+                print("(!) Для нескольких правых частей история итераций не сохраняется, "
+                      "выбранный способ хранения истории не применен.")
+            self.print_block(solution, iterations)
+            return solution
+
+        # Выводим результаты
+        rows = self.history.rows()
+        if rows:
+            header = "№  | " + " | ".join(f"x{i + 1:<8}" for i in range(self.n)) + " | " \
+                     + " | ".join(f"eps{i + 1:<8}" for i in range(self.n)) + " |"
+            print(header)
+        for iteration, x, errors in rows:
+            row = f"{iteration - 1} | " + " | ".join(f"{val: .6f}" for val in x) + " | " + " | ".join(f"{eps: .6f}" for eps in errors)
+            print(row)
+        if self.history.describe():
+            print(self.history.describe())
+
+        print(f"\n{self.summary()}, число итераций: {iterations}")
+        if self.diverged:
+            print(f"(!) Итерации прерваны: погрешность не уменьшалась {self.stall_window} итераций подряд "
+                  f"или превышен лимит в {self.max_iterations} итераций. Метод расходится.")
+            return None
+
+        # Вывод решения
+        print("\nРешение системы:")
+        for i, sol in enumerate(solution):
+            print(f"[{i + 1}] = {sol:.25f}")
+
+        print("\nВектор невязки:")
+        for i, res in enumerate(self.residuals(solution)):
+            print(f"[{i + 1}] = {res:.12f}")
+
+        return solution
+
+    def print_block(self, solution, iterations):
+        """
+        Вывод результатов для нескольких правых частей: по столбцу на систему.
+        """
+        residual_norms = np.max(np.abs(self.residuals(solution)), axis=0)
+        print(f"\n{self.summary()}, правых частей: {solution.shape[1]}, "
+              f"блочных шагов: {iterations.max()}")
+        print("b  | Итераций | Норма невязки | Решение")
+        for k in range(solution.shape[1]):
+            if self.diverged[k]:
+                print(f"{k + 1} | {iterations[k]} | расходится")
+                continue
+            print(f"{k + 1} | {iterations[k]} | {residual_norms[k]:.3e} | "
+                  + " ".join(f"{val: .6f}" for val in solution[:, k]))
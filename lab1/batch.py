@@ -0,0 +1,140 @@
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from history import NoHistory
+from main import engines, read_system_file
+from preprocess_cache import PreprocessCache
+
+
+BATCH_ENGINES = [name for name in engines if name != "parallel"]  # Параллельный метод сам запускает процессы
+CHUNK_SIZE = 16  # Число файлов, передаваемых процессу за раз
+
+caches = {}  # Кэши подготовки матриц рабочего процесса по каталогам
+
+
+def collect_files(patterns):
+    """
+    Список файлов систем по путям к каталогам, файлам или шаблонам glob.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.extend(sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                                if os.path.isfile(os.path.join(pattern, name))))
+        else:
+            files.extend(sorted(glob.glob(pattern)))
+    return files
+
+
+def finite_or_none(values):
+    """
+    Значения для JSON: nan и бесконечности (при расходимости) заменяются на None (null).
+    """
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def solve_file(task):
+    """
+    Решение одной системы из файла без вывода в консоль.
+    Ошибка при решении записывается в результат этой системы и не прерывает остальные.
+    :param task: Тройка (имя файла, название реализации метода, каталог кэша подготовки или None).
+    :return: Словарь с результатом: решение, число итераций, норма невязки, время.
+    """
+    filename, engine, cache_directory = task
+    start = time.perf_counter()
+    result = {"file": filename, "engine": engine}
+    try:
+        result.update(solve_system(filename, engine, cache_directory))
+    except Exception as e:
+        result.update(status="error", message=f"{type(e).__name__}: {e}")
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+def solve_system(filename, engine, cache_directory):
+    """
+    Чтение и решение системы. Решение и невязка приводятся к исходной системе:
+    при подготовке вектор b делится на max|b|, поэтому решение умножается обратно на этот множитель.
+    :return: Словарь с полями результата.
+    """
+    method_class, max_n = engines[engine]
+    matrix, vector_b, tolerance = read_system_file(filename, method_class, max_n)
+    if matrix is None:
+        return {"status": "error", "message": "не удалось прочитать систему из файла"}
+
+    # Реализация на списках масштабирует строки на месте, поэтому невязка считается по копии исходной системы
+    original_matrix = np.array(matrix, dtype=float) if isinstance(matrix, list) else matrix
+    original_b = np.array(vector_b, dtype=float)
+
+    options = {}
+    if method_class.uses_cache:
+        # В памяти процесса кэш есть всегда; каталог позволяет переиспользовать подготовку между запусками
+        if cache_directory not in caches:
+            caches[cache_directory] = PreprocessCache(directory=cache_directory)
+        options["cache"] = caches[cache_directory]
+
+    with NoHistory() as history:
+        method = method_class(matrix, vector_b, tolerance, history=history, **options)
+        if not method.prepare():
+            return {"status": "error", "message": "на диагонали матрицы остались нули"}
+
+        solution, iterations = method.iterate()
+    solution = np.asarray(solution, dtype=float) * method.b_scale
+    with np.errstate(all="ignore"):
+        residuals = original_matrix @ solution - original_b
+    return {
+        "status": "diverged" if np.any(method.diverged) else "ok",
+        "solution": finite_or_none(solution),
+        "iterations": np.asarray(iterations).tolist(),
+        "residual_norm": finite_or_none(np.max(np.abs(residuals))),
+    }
+
+
+def run_batch(files, output, engine="numpy", workers=None, cache_directory=None):
+    """
+    Решение множества систем пулом процессов. Результаты пишутся по одной JSON-строке на систему
+    в порядке следования файлов.
+    :return: Число систем по статусам.
+    """
+    statuses = {}
+    tasks = [(filename, engine, cache_directory) for filename in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(output, "w") as out:
+        for result in pool.map(solve_file, tasks, chunksize=CHUNK_SIZE):
+            out.write(json.dumps(result, ensure_ascii=False, allow_nan=False) + "\n")
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    return statuses
+
+
+def main():
+    """
+    Пакетный (неинтерактивный) запуск: python batch.py <каталог или шаблон>... -o results.jsonl
+    """
+    parser = argparse.ArgumentParser(description="Пакетное решение систем из файлов формата input.txt, .bin или .mtx.")
+    parser.add_argument("paths", nargs="+", help="каталоги, файлы или шаблоны glob с системами")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="файл для результатов (JSON Lines)")
+    parser.add_argument("-e", "--engine", default="numpy", choices=BATCH_ENGINES, help="реализация метода")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="число процессов (по умолчанию - число ядер)")
+    parser.add_argument("-c", "--cache", default=None, help="каталог кэша подготовки матриц между запусками")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("Не найдено ни одного файла с системой.")
+        return
+
+    start = time.perf_counter()
+    statuses = run_batch(files, args.output, args.engine, args.workers, args.cache)
+    print(f"Решено систем: {len(files)} за {time.perf_counter() - start:.2f} с, "
+          + ", ".join(f"{status}: {count}" for status, count in statuses.items())
+          + f". Результаты записаны в {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import struct
+import sys
+
+import numpy as np
+
+
+MAGIC = b"SLEBIN01"  # Сигнатура двоичного файла системы
+HEADER = struct.Struct("<8sqd")  # Сигнатура, размерность n (int64), точность (float64)
+
+
+def write_binary_system(filename, matrix, vector_b, tolerance):
+    """
+    Запись системы в двоичный файл: заголовок, затем матрица n×n и вектор b (float64, little-endian, по строкам).
+    Матрица хранится отдельно от b, поэтому при чтении она отображается в память непрерывным массивом.
+    """
+    matrix = np.asarray(matrix, dtype="<f8")
+    vector_b = np.asarray(vector_b, dtype="<f8")
+    n = matrix.shape[0]
+    if matrix.shape != (n, n) or vector_b.shape != (n,):
+        raise ValueError(f"Ожидается матрица n×n и вектор длины n, а не {matrix.shape} и {vector_b.shape}.")
+
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, n, float(tolerance)))
+        file.write(np.ascontiguousarray(matrix).tobytes())
+        file.write(vector_b.tobytes())
+
+
+def read_binary_system(filename):
+    """
+    Чтение системы из двоичного файла через отображение в память (np.memmap, только чтение).
+    Данные не копируются: страницы матрицы подгружаются операционной системой по мере обращения к ним.
+    :return: Матрица (memmap n×n), вектор свободных членов (memmap длины n) и точность.
+    """
+    with open(filename, "rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("Файл слишком короткий для заголовка.")
+
+    magic, n, tolerance = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Неверная сигнатура файла (ожидается двоичный файл системы).")
+    if n <= 0:
+        raise ValueError("Размерность системы должна быть положительным числом.")
+    if tolerance <= 0:
+        raise ValueError("Точность должна быть положительным числом.")
+
+    data = np.memmap(filename, dtype="<f8", mode="r", offset=HEADER.size)
+    if data.size != n * (n + 1):
+        raise ValueError(f"Ожидается {n * (n + 1)} чисел после заголовка, а в файле {data.size}.")
+
+    return data[:n * n].reshape(n, n), data[n * n:], tolerance
+
+
+def convert_text_file(source, target):
+    """
+    Преобразование файла формата input.txt (одна правая часть) в двоичный формат.
+    """
+    with open(source, "r") as file:
+        lines = file.read().split("\n")
+    n = int(lines[0])
+    rows = np.array([line.split() for line in lines[1:n + 1]], dtype=np.float64)
+    tolerance = float(lines[n + 1])
+    if rows.shape != (n, n + 1):
+        raise ValueError(f"Ожидается {n} строк по {n + 1} чисел.")
+    write_binary_system(target, rows[:, :n], rows[:, n], tolerance)
+
+
+if __name__ == "__main__":
+    # python binary_format.py input.txt input.bin
+    if len(sys.argv) != 3:
+        print("Использование: python binary_format.py <текстовый файл> <двоичный файл>")
+    else:
+        convert_text_file(sys.argv[1], sys.argv[2])
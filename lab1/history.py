@@ -0,0 +1,112 @@
+from collections import deque
+from copy import copy
+
+import numpy as np
+
+
+class History:
+    def __init__(self):
+        """
+        История итераций: хранит все приближения и погрешности (поведение по умолчанию).
+        """
+        self.entries = []
+
+    def append(self, iteration, x, errors):
+        """
+        Добавление записи об итерации.
+        :param iteration: Номер итерации.
+        :param x: Текущее приближение (копируется, так как методы обновляют его на месте).
+        :param errors: Погрешности компонент на этой итерации.
+        """
+        self.entries.append((iteration, copy(x), errors))
+
+    def rows(self):
+        """
+        Сохраненные записи (номер итерации, приближение, погрешности) для вывода.
+        """
+        return self.entries
+
+    def close(self):
+        """
+        Завершение записи истории после окончания итераций (повторный вызов ничего не делает).
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # История закрывается и при досрочном выходе (исключение, отказ от итераций)
+        self.close()
+
+    def describe(self):
+        """
+        Описание того, что было сохранено, для вывода вместо таблицы.
+        """
+        return ''
+
+
+class NoHistory(History):
+    def __init__(self):
+        """
+        История не сохраняется: память не зависит от числа итераций.
+        """
+        super().__init__()
+
+    def append(self, iteration, x, errors):
+        pass
+
+    def describe(self):
+        return 'История итераций не сохранялась.'
+
+
+class RingHistory(History):
+    def __init__(self, size):
+        """
+        Кольцевой буфер: хранятся только последние size итераций.
+        :param size: Число сохраняемых итераций.
+        """
+        super().__init__()
+        self.entries = deque(maxlen=size)
+
+    def describe(self):
+        return f'Показаны последние {self.entries.maxlen} итераций.'
+
+
+class TraceHistory(History):
+    def __init__(self, filename, binary=False):
+        """
+        Потоковая запись истории в файл по мере выполнения итераций.
+        Формат CSV: iteration, x1..xn, eps1..epsn.
+        Двоичный формат: те же значения построчно как float64 без заголовка.
+        :param filename: Путь к файлу трассировки.
+        :param binary: Писать ли двоичный файл вместо CSV.
+        """
+        super().__init__()
+        self.filename = filename
+        self.binary = binary
+        self.file = open(filename, 'wb' if binary else 'w')
+        self.header_written = False
+
+    def append(self, iteration, x, errors):
+        if self.binary:
+            np.concatenate(([iteration], x, errors)).astype(np.float64).tofile(self.file)
+            return
+
+        if not self.header_written:
+            n = len(x)
+            self.file.write(','.join(['iteration'] + [f'x{i + 1}' for i in range(n)]
+                                     + [f'eps{i + 1}' for i in range(n)]) + '\n')
+            self.header_written = True
+        self.file.write(f'{iteration},' + ','.join(map(repr, map(float, x))) + ','
+                        + ','.join(map(repr, map(float, errors))) + '\n')
+
+    def rows(self):
+        return []
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def describe(self):
+        return f'История итераций записана в файл {self.filename}.'
@@ -0,0 +1,253 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy.linalg import solve_triangular
+from scipy.sparse import csr_matrix, issparse
+
+from array_method import ArrayIterativeMethod
+from monitor import DivergenceMonitor
+
+
+GMRES_RESTART = 30  # Размерность подпространства Крылова до перезапуска GMRES
+
+
+class KrylovMethod(ArrayIterativeMethod, ABC):
+    name = None
+    supports_multiple_rhs = False
+    accepts_sparse = True
+    sweep_modes = ()
+    uses_cache = False
+
+    def __init__(self, matrix, vector_b, tolerance, mode=None, omega=None, history=None, preconditioned=True):
+        """
+        Общая часть методов подпространств Крылова с предобуславливателем Якоби (диагональю матрицы).
+        Используются те же вход, точность (норма приращения ||x_k+1 - x_k||∞ < tolerance)
+        и вывод невязки, что и в методе простых итераций.
+        :param matrix: Матрица коэффициентов системы (плотная или разреженная).
+        :param vector_b: Вектор свободных членов.
+        :param tolerance: Точность решения.
+        :param mode: Не используется (для совместимости с методом простых итераций).
+        :param omega: Не используется (для совместимости с методом простых итераций).
+        :param history: Политика хранения истории итераций (по умолчанию хранится вся история).
+        :param preconditioned: Использовать ли предобуславливатель Якоби.
+        """
+        super().__init__(matrix, vector_b, tolerance, self.name, None, history)
+        self.preconditioned = preconditioned
+
+    @staticmethod
+    def as_matrix(matrix):
+        """
+        Разреженная матрица приводится к CSR, остальное - к ndarray без копирования.
+        """
+        if issparse(matrix):
+            return csr_matrix(matrix, dtype=np.float64)
+        return np.asarray(matrix, dtype=np.float64)
+
+    def prepare(self):
+        """
+        Подготовка системы. Строки не переставляются и не масштабируются по отдельности:
+        это разрушило бы симметрию матрицы, нужную методу сопряженных градиентов.
+        Вектор b масштабируется так же, как в методе простых итераций.
+        :return: False, если на диагонали есть нули (предобуславливатель Якоби невозможен).
+        """
+        max_b = np.max(np.abs(self.vector_b))
+        if max_b != 0:
+            self.vector_b = self.vector_b / max_b
+            self.b_scale = max_b
+
+        self.diagonal = np.asarray(self.matrix.diagonal(), dtype=np.float64)
+        if not self.preconditioned:
+            return True
+        return bool(np.all(self.diagonal != 0))
+
+    def precondition(self, vector):
+        """
+        Применение предобуславливателя Якоби M⁻¹ = D⁻¹.
+        """
+        if not self.preconditioned:
+            return vector
+        return vector / self.diagonal
+
+    def precheck(self):
+        return True
+
+    def summary(self):
+        return f"Метод: {self.name}" + (", предобуславливатель Якоби" if self.preconditioned else "")
+
+    @abstractmethod
+    def steps(self, x):
+        """
+        Итерации метода: обновляют x на месте и возвращают приращение на каждом шаге.
+        Если метод потерпел крах (деление на ноль), устанавливается self.diverged.
+        """
+
+    def iterate(self):
+        """
+        Итерационный процесс с тем же критерием остановки и контролем расходимости,
+        что и в методе простых итераций.
+        :return: Найденное решение и число итераций (история передается в self.history).
+        """
+        x = np.zeros(self.n)
+        iterations = 0
+        monitor = DivergenceMonitor(self.stall_window, self.max_iterations)
+        self.diverged = False
+
+        for step in self.steps(x):
+            iterations += 1
+            errors = np.abs(step)
+            self.history.append(iterations, x, errors)
+
+            error = self.norm(errors)
+            if error < self.tolerance:
+                break
+            if monitor.stalled(iterations, error)[0]:
+                self.diverged = True
+                break
+
+        self.history.close()
+        return x, iterations
+
+
+class ConjugateGradientMethod(KrylovMethod):
+    name = 'cg'
+
+    def precheck(self):
+        """
+        Метод сопряженных градиентов применим только к симметричным положительно определенным матрицам.
+        """
+        asymmetry = abs(self.matrix - self.matrix.T).max()
+        if asymmetry > 1e-12 * abs(self.matrix).max() or np.any(self.diagonal <= 0):
+            print("(!) Матрица не симметрична или не положительно определена, "
+                  "метод сопряженных градиентов может не сойтись.")
+        return True
+
+    def steps(self, x):
+        r = self.vector_b - self.matrix @ x
+        z = self.precondition(r)
+        p = z.copy()
+        rz = r @ z
+
+        while rz != 0:
+            ap = self.matrix @ p
+            curvature = p @ ap
+            if curvature == 0:
+                self.diverged = True
+                return
+
+            alpha = rz / curvature
+            step = alpha * p
+            x += step
+            r -= alpha * ap
+            yield step
+
+            z = self.precondition(r)
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+
+
+class BiCGStabMethod(KrylovMethod):
+    name = 'bicgstab'
+
+    def steps(self, x):
+        r = self.vector_b - self.matrix @ x
+        r_hat = r.copy()
+        rho = alpha = omega = 1.0
+        v = np.zeros(self.n)
+        p = np.zeros(self.n)
+
+        while True:
+            rho_new = r_hat @ r
+            if rho_new == 0:
+                # Невязка нулевая - решение найдено, иначе - крах метода
+                self.diverged = bool(np.any(r != 0))
+                return
+
+            p = r + (rho_new / rho) * (alpha / omega) * (p - omega * v)
+            p_hat = self.precondition(p)
+            v = self.matrix @ p_hat
+            alpha = rho_new / (r_hat @ v)
+            s = r - alpha * v
+
+            s_hat = self.precondition(s)
+            t = self.matrix @ s_hat
+            tt = t @ t
+            omega = (t @ s) / tt if tt != 0 else 0.0
+
+            step = alpha * p_hat + omega * s_hat
+            x += step
+            yield step
+
+            if omega == 0:
+                if np.any(s != 0):
+                    self.diverged = True
+                return
+
+            r = s - omega * t
+            rho = rho_new
+
+
+class GMRESMethod(KrylovMethod):
+    name = 'gmres'
+
+    def __init__(self, matrix, vector_b, tolerance, mode=None, omega=None, history=None, preconditioned=True,
+                 restart=GMRES_RESTART):
+        """
+        GMRES с перезапуском и правым предобуславливателем Якоби.
+        :param restart: Размерность подпространства до перезапуска.
+        """
+        super().__init__(matrix, vector_b, tolerance, mode, omega, history, preconditioned)
+        self.restart = restart
+
+    def steps(self, x):
+        m = min(self.restart, self.n)
+        while True:
+            r = self.vector_b - self.matrix @ x
+            beta = np.linalg.norm(r)
+            if beta == 0:
+                return
+
+            basis = np.zeros((m + 1, self.n))
+            hessenberg = np.zeros((m + 1, m))
+            cs, sn = np.zeros(m), np.zeros(m)
+            g = np.zeros(m + 1)
+            g[0] = beta
+            basis[0] = r / beta
+            y_prev = np.zeros(0)
+
+            for k in range(m):
+                # Арнольди с модифицированной ортогонализацией Грама-Шмидта
+                w = self.matrix @ self.precondition(basis[k])
+                for j in range(k + 1):
+                    hessenberg[j, k] = w @ basis[j]
+                    w -= hessenberg[j, k] * basis[j]
+                h_next = np.linalg.norm(w)
+                if h_next != 0:
+                    basis[k + 1] = w / h_next
+
+                # Вращения Гивенса приводят матрицу Хессенберга к треугольному виду
+                for j in range(k):
+                    hessenberg[j, k], hessenberg[j + 1, k] = \
+                        cs[j] * hessenberg[j, k] + sn[j] * hessenberg[j + 1, k], \
+                        -sn[j] * hessenberg[j, k] + cs[j] * hessenberg[j + 1, k]
+                denominator = np.hypot(hessenberg[k, k], h_next)
+                if denominator == 0:
+                    self.diverged = True
+                    return
+                cs[k], sn[k] = hessenberg[k, k] / denominator, h_next / denominator
+                hessenberg[k, k] = denominator
+                g[k + 1] = -sn[k] * g[k]
+                g[k] = cs[k] * g[k]
+
+                # Приращение решения на этом шаге: x_k - x_k-1 = M⁻¹ V (y_k - y_k-1)
+                y = solve_triangular(hessenberg[:k + 1, :k + 1], g[:k + 1])
+                dy = y.copy()
+                dy[:k] -= y_prev
+                step = self.precondition(dy @ basis[:k + 1])
+                x += step
+                y_prev = y
+                yield step
+
+                if h_next == 0:
+                    # Подпространство инвариантно - найдено точное решение
+                    return
@@ -1,15 +1,52 @@
+import numpy as np
+from scipy.io import mmread
+
+from array_method import ArrayIterativeMethod, MODES, PROBE_SWEEPS, relaxation_from_probe
+from binary_format import read_binary_system
+from history import History, NoHistory, RingHistory, TraceHistory
+from krylov import BiCGStabMethod, ConjugateGradientMethod, GMRESMethod
+from monitor import DivergenceMonitor, MAX_ITERATIONS, STALL_WINDOW
+from parallel_method import ParallelIterativeMethod
+from permutation import find_dominant_permutation
+from preprocess_cache import PreprocessCache
+from sparse_method import SparseIterativeMethod
+
+
+MAX_N = 20  # Ограничение размерности для эталонной реализации на списках
+
+# Подготовка матриц запоминается на время работы программы: повторное решение с той же матрицей
+# (другой режим или другой вектор b) начинается сразу с итераций
+preprocess_cache = PreprocessCache()
+
+
 class IterativeMethod:
-    def __init__(self, matrix, vector_b, tolerance):
+    supports_multiple_rhs = False  # Вектор b может быть только одним вектором
+    accepts_sparse = False  # Можно ли передавать разреженную матрицу (файлы .mtx)
+    sweep_modes = MODES  # Доступные режимы шага
+    uses_cache = False  # Можно ли передать кэш подготовки матриц
+
+    def __init__(self, matrix, vector_b, tolerance, mode="jacobi", omega=None, history=None):
         """
         Инициализация метода с матрицей коэффициентов, вектором свободных членов и точностью.
         :param matrix: Матрица коэффициентов системы.
         :param vector_b: Вектор свободных членов.
         :param tolerance: Точность решения.
+        :param mode: Режим шага: "jacobi", "seidel" или "sor".
+        :param omega: Параметр релаксации для "sor" (None - подобрать автоматически).
+        :param history: Политика хранения истории итераций (по умолчанию хранится вся история).
         """
         self.matrix = matrix
         self.vector_b = vector_b
         self.tolerance = tolerance
         self.n = len(matrix)  # Размерность системы
+        self.mode = mode
+        self.omega = 1.0 if mode == "seidel" else omega
+        self.history = history if history is not None else History()
+        self.dominant = None  # Достигнуто ли строгое диагональное преобладание
+        self.b_scale = 1.0  # Делитель вектора b при масштабировании: решение исходной системы - x * b_scale
+        self.stall_window = STALL_WINDOW  # Окно контроля расходимости
+        self.max_iterations = MAX_ITERATIONS  # Предельное число итераций
+        self.diverged = False  # Были ли итерации прерваны из-за расходимости
 
     def check_diagonal_dominance(self):
         """
@@ -23,15 +60,16 @@ class IterativeMethod:
 
     def make_diagonal_dominance(self):
         """
-        Попытка перестановки строк для достижения диагонального преобладания.
+        Перестановка строк для достижения диагонального преобладания.
+        Перестановка ищется как решение задачи о назначениях строк на места диагонали.
+        :return: Достигнуто ли строгое диагональное преобладание.
         """
-        for i in range(self.n):
-            # Ищем строку с максимальным элементом в i-й колонке для перестановки
-            max_row = max(range(i, self.n), key=lambda r: abs(self.matrix[r][i]))
-            if max_row != i:
-                # Перестановка строк
-                self.matrix[i], self.matrix[max_row] = self.matrix[max_row], self.matrix[i]
-                self.vector_b[i], self.vector_b[max_row] = self.vector_b[max_row], self.vector_b[i]
+        permutation, dominant = find_dominant_permutation(np.array(self.matrix, dtype=float))
+        if permutation is not None:
+            # Перестановка строк
+            self.matrix = [self.matrix[row] for row in permutation]
+            self.vector_b = [self.vector_b[row] for row in permutation]
+        return dominant
 
     def scale_matrix_and_vector(self):
         """
@@ -49,6 +87,7 @@ class IterativeMethod:
                 self.vector_b[i] *= scale_factor
 
         if max_b != 0:
+            self.b_scale = max_b
             b_scale_factor = 1 / max_b
             self.vector_b = [b * b_scale_factor for b in self.vector_b]
 
@@ -60,81 +99,150 @@ class IterativeMethod:
         """
         return max(abs(x) for x in vector)
 
+    def jacobi_step(self, x_old, x_new):
+        """
+        Шаг метода Якоби: новое приближение записывается в x_new.
+        """
+        for i in range(self.n):
+            sum_terms = sum(self.matrix[i][j] * x_old[j] for j in range(self.n) if i != j)
+            x_new[i] = (self.vector_b[i] - sum_terms) / self.matrix[i][i]
+
+    def tune_omega(self, probe_sweeps=PROBE_SWEEPS):
+        """
+        Автоматический подбор ω по нескольким пробным шагам Якоби из нулевого приближения.
+        """
+        x_old = [0] * self.n
+        x_new = [0] * self.n
+        norms = []
+        for _ in range(probe_sweeps):
+            self.jacobi_step(x_old, x_new)
+            norms.append(self.norm([x_new[i] - x_old[i] for i in range(self.n)]))
+            x_old, x_new = x_new, x_old
+        return relaxation_from_probe(norms)
+
     def iterate(self):
         """
-        Метод простых итераций для решения системы.
+        Итерационный процесс в выбранном режиме (Якоби, Гаусс-Зейдель или верхняя релаксация).
+        Прерывается, если погрешность перестала уменьшаться (см. DivergenceMonitor).
+        :return: Найденное решение и число итераций (история передается в self.history).
         """
         # Начальные значения (все элементы вектора x инициализируем нулями)
         x_old = [0] * self.n
         x_new = [0] * self.n
         iterations = 0
-        epsilons = []  # Список для погрешностей на каждом шаге
-        solution_history = []  # История решений для вывода
+        monitor = DivergenceMonitor(self.stall_window, self.max_iterations)
+        self.diverged = False
 
         while True:
             iterations += 1
-            # Для каждой переменной вычисляем новое значение по формуле метода простых итераций
-            for i in range(self.n):
-                sum_terms = sum(self.matrix[i][j] * x_old[j] for j in range(self.n) if i != j)
-                x_new[i] = (self.vector_b[i] - sum_terms) / self.matrix[i][i]
-
-            # Вычисляем погрешности
-            errors = [abs(x_new[i] - x_old[i]) for i in range(self.n)]
-            epsilons.append(errors)  # Добавляем погрешности в историю
-
-            solution_history.append(x_new[:])  # Сохраняем текущее решение для вывода
+            if self.mode == "jacobi":
+                # Для каждой переменной вычисляем новое значение по формуле метода простых итераций
+                self.jacobi_step(x_old, x_new)
+                errors = [abs(x_new[i] - x_old[i]) for i in range(self.n)]
+            else:
+                # Гаусс-Зейдель и верхняя релаксация: обновляем x_new на месте,
+                # новые компоненты сразу используются в следующих строках
+                errors = [0] * self.n
+                for i in range(self.n):
+                    sum_terms = sum(self.matrix[i][j] * x_new[j] for j in range(self.n) if i != j)
+                    value = x_new[i] + self.omega * ((self.vector_b[i] - sum_terms) / self.matrix[i][i] - x_new[i])
+                    errors[i] = abs(value - x_new[i])
+                    x_new[i] = value
+
+            self.history.append(iterations, x_new, errors)  # Сохраняем решение и погрешности согласно политике
 
             # Если погрешность меньше заданной точности, выходим из цикла
-            if self.norm(errors) < self.tolerance:
+            error = self.norm(errors)
+            if error < self.tolerance:
+                break
+            # Если погрешность давно не уменьшается, метод расходится
+            if monitor.stalled(iterations, error)[0]:
+                self.diverged = True
                 break
 
-            # Обновляем старое решение для следующей итерации
-            x_old = x_new[:]
+            if self.mode == "jacobi":
+                # Меняем буферы местами вместо копирования решения
+                x_old, x_new = x_new, x_old
 
-        return solution_history, epsilons, iterations
+        self.history.close()
+        return x_new, iterations
 
-    def solve(self):
+    def prepare(self):
         """
-        Решение системы уравнений.
+        Подготовка системы: перестановка строк, масштабирование и подбор ω.
         """
         # Проверка на диагональное преобладание
-        if not self.check_diagonal_dominance():
-            self.make_diagonal_dominance()
+        self.dominant = self.check_diagonal_dominance() or self.make_diagonal_dominance()
 
         # Масштабируем матрицу и вектор b
         self.scale_matrix_and_vector()
 
-        # Решаем методом простых итераций
-        solution_history, epsilons, iterations = self.iterate()
+        if self.mode == "sor" and self.omega is None:
+            self.omega = self.tune_omega()
+        return True
+
+    def residuals(self, x):
+        """
+        Вектор невязки Ax - b для подготовленной системы.
+        """
+        return [sum(self.matrix[i][j] * x[j] for j in range(self.n)) - self.vector_b[i] for i in range(self.n)]
+
+    def solve(self):
+        """
+        Решение системы уравнений.
+        """
+        self.prepare()
+        if not self.dominant:
+            print("(!) Строгого диагонального преобладания нельзя достичь перестановкой строк, "
+                  "сходимость не гарантирована.")
+
+        # Решаем выбранным методом
+        solution, iterations = self.iterate()
 
         # Выводим результаты
-        print("№  | x1        | x2        | x3       | eps1        | eps2       | eps3       |")
-        for i in range(iterations):
-            row = f"{i} | " + " | ".join(f"{val: .6f}" for val in solution_history[i]) + " | " + " | ".join(f"{eps: .6f}" for eps in epsilons[i])
+        rows = self.history.rows()
+        if rows:
+            print("№  | x1        | x2        | x3       | eps1        | eps2       | eps3       |")
+        for iteration, x, errors in rows:
+            row = f"{iteration - 1} | " + " | ".join(f"{val: .6f}" for val in x) + " | " + " | ".join(f"{eps: .6f}" for eps in errors)
             print(row)
+        if self.history.describe():
+            print(self.history.describe())
+
+        print(f"\nРежим: {self.mode}, ω = {self.omega or 1.0:.4f}, число итераций: {iterations}")
+        if self.diverged:
+            print(f"(!) Итерации прерваны: погрешность не уменьшалась {self.stall_window} итераций подряд "
+                  f"или превышен лимит в {self.max_iterations} итераций. Метод расходится.")
+            return
 
         # Вывод решения
         print("\nРешение системы:")
-        for i, sol in enumerate(solution_history[-1]):
+        for i, sol in enumerate(solution):
             print(f"[{i + 1}] = {sol:.25f}")
 
         # Вывод вектора невязки (разница между матрицей A и вектором b)
-        residuals = [sum(self.matrix[i][j] * solution_history[-1][j] for j in range(self.n)) - self.vector_b[i] for i in range(self.n)]
+        residuals = self.residuals(solution)
         print("\nВектор невязки:")
         for i, res in enumerate(residuals):
             print(f"[{i + 1}] = {res:.12f}")
 
 
-def input_matrix_and_tolerance_from_console():
+def input_matrix_and_tolerance_from_console(max_n=MAX_N):
     """
     Ввод матрицы и точности с клавиатуры с проверками на корректность.
+    :param max_n: Максимальная размерность системы (None - без ограничения).
     :return: Матрица и точность.
     """
     while True:
         try:
-            n = int(input("Введите размерность системы (n <= 20): "))
-            if n <= 0 or n > 20:
-                raise ValueError("Размерность должна быть положительным числом, не превышающим 20.")
+            if max_n is None:
+                n = int(input("Введите размерность системы: "))
+            else:
+                n = int(input(f"Введите размерность системы (n <= {max_n}): "))
+            if n <= 0:
+                raise ValueError("Размерность должна быть положительным числом.")
+            if max_n is not None and n > max_n:
+                raise ValueError(f"Размерность не должна превышать {max_n}.")
             break
         except ValueError as e:
             print(f"Ошибка: {e}. Попробуйте снова.")
@@ -169,10 +277,12 @@ def input_matrix_and_tolerance_from_console():
     return matrix, vector_b, tolerance
 
 
-def input_matrix_and_tolerance_from_file(filename):
+def input_matrix_and_tolerance_from_file(filename, max_n=MAX_N, multiple_rhs=False):
     """
     Ввод матрицы и точности из файла с проверками на корректность.
     :param filename: Путь к файлу с данными.
+    :param max_n: Максимальная размерность системы (None - без ограничения).
+    :param multiple_rhs: Разрешить несколько свободных членов в строке (m правых частей после n коэффициентов).
     :return: Матрица и точность.
     """
     matrix = []
@@ -181,17 +291,31 @@ def input_matrix_and_tolerance_from_file(filename):
     try:
         with open(filename, 'r') as file:
             n = int(file.readline().strip())
-            if n <= 0 or n > 20:
-                raise ValueError("Размерность системы должна быть положительным числом, не превышающим 20.")
+            if n <= 0:
+                raise ValueError("Размерность системы должна быть положительным числом.")
+            if max_n is not None and n > max_n:
+                raise ValueError(f"Размерность системы не должна превышать {max_n}.")
 
             for i in range(n):
                 row = list(map(float, file.readline().strip().split()))
+                if multiple_rhs:
+                    row_length = row_length if i > 0 else len(row)
+                    if len(row) <= n or len(row) != row_length:
+                        raise ValueError(
+                            f"Во всех строках должно быть одинаковое количество элементов, больше {n} "
+                            f"(коэффициенты матрицы и свободные члены).")
+                    matrix.append(row[:n])  # Первые n элементов идут в матрицу
+                    vector_b.append(row[n:])  # Остальные - свободные члены для каждой правой части
+                    continue
                 if len(row) != n + 1:
                     raise ValueError(
                         f"Количество элементов в строке должно быть {n + 1} (для матрицы и свободного члена).")
                 matrix.append(row[:-1])  # Все элементы, кроме последнего, идут в матрицу
                 vector_b.append(row[-1])  # Последний элемент строки - свободный член
 
+            if multiple_rhs and len(vector_b[0]) == 1:
+                vector_b = [b[0] for b in vector_b]  # Одна правая часть - обычный вектор
+
             tolerance = float(file.readline().strip())
             if tolerance <= 0:
                 raise ValueError("Точность должна быть положительным числом.")
@@ -203,6 +327,207 @@ def input_matrix_and_tolerance_from_file(filename):
     return matrix, vector_b, tolerance
 
 
+def input_matrix_and_tolerance_from_mtx(filename, multiple_rhs=True):
+    """
+    Ввод разреженной системы из файла Matrix Market (coordinate).
+    Файл содержит расширенную матрицу n×(n+m): последние m столбцов - свободные члены.
+    Точность задается строкой комментария вида "% tolerance 0.0001".
+    :param filename: Путь к файлу с данными.
+    :param multiple_rhs: Разрешить несколько правых частей (m > 1).
+    :return: Матрица в формате CSR, вектор свободных членов и точность.
+    """
+    try:
+        tolerance = None
+        with open(filename, 'r') as file:
+            for line in file:
+                if not line.startswith('%'):
+                    break
+                words = line.lstrip('%').split()
+                if len(words) == 2 and words[0].lower() == "tolerance":
+                    tolerance = float(words[1])
+
+        if tolerance is None:
+            raise ValueError("В файле не задана точность (строка комментария \"% tolerance <число>\").")
+        if tolerance <= 0:
+            raise ValueError("Точность должна быть положительным числом.")
+
+        augmented = mmread(filename)
+        if not hasattr(augmented, "tocsr"):
+            raise ValueError("Ожидается файл в координатном формате (coordinate).")
+        augmented = augmented.tocsr()
+
+        n = augmented.shape[0]
+        if n <= 0 or augmented.shape[1] <= n:
+            raise ValueError(f"Размер матрицы должен быть n×(n+m), а не {augmented.shape[0]}×{augmented.shape[1]}.")
+        if not multiple_rhs and augmented.shape[1] != n + 1:
+            raise ValueError(f"Размер матрицы должен быть n×(n+1) (для матрицы и свободного члена), "
+                             f"а не {augmented.shape[0]}×{augmented.shape[1]}.")
+
+        matrix = augmented[:, :n]
+        vector_b = augmented[:, n:].toarray()
+        if vector_b.shape[1] == 1:
+            vector_b = vector_b.ravel()
+
+    except (ValueError, IndexError, FileNotFoundError) as e:
+        print(f"Ошибка при чтении файла: {e}. Проверьте файл и попробуйте снова.")
+        return None, None, None
+
+    return matrix, vector_b, tolerance
+
+
+def input_matrix_and_tolerance_from_binary(filename, max_n=MAX_N):
+    """
+    Ввод системы из двоичного файла (см. binary_format.py). Матрица отображается в память
+    и не копируется, поэтому загрузка занимает время, не зависящее от размерности.
+    :param filename: Путь к файлу с данными.
+    :param max_n: Максимальная размерность системы (None - без ограничения).
+    :return: Матрица (np.memmap), вектор свободных членов и точность.
+    """
+    try:
+        matrix, vector_b, tolerance = read_binary_system(filename)
+        if max_n is not None and len(matrix) > max_n:
+            raise ValueError(f"Размерность системы не должна превышать {max_n}.")
+
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Ошибка при чтении файла: {e}. Проверьте файл и попробуйте снова.")
+        return None, None, None
+
+    return matrix, vector_b, tolerance
+
+
+# Доступные реализации метода и ограничение размерности для каждой из них
+engines = {
+    "list": (IterativeMethod, MAX_N),
+    "numpy": (ArrayIterativeMethod, None),
+    "sparse": (SparseIterativeMethod, None),
+    "cg": (ConjugateGradientMethod, None),
+    "bicgstab": (BiCGStabMethod, None),
+    "gmres": (GMRESMethod, None),
+    "parallel": (ParallelIterativeMethod, None),
+}
+
+
+def read_system_file(filename, method_class, max_n):
+    """
+    Чтение системы из файла; формат определяется по расширению:
+    .mtx - Matrix Market, .bin - двоичный файл, остальные - текстовый формат input.txt.
+    :return: Матрица, вектор свободных членов и точность (None, None, None при ошибке).
+    """
+    extension = filename.lower().rsplit(".", 1)[-1]
+    if extension == "mtx":
+        if not method_class.accepts_sparse:
+            print("Файлы Matrix Market (.mtx) поддерживаются только реализациями "
+                  + ", ".join(f"'{name}'" for name, (cls, _) in engines.items() if cls.accepts_sparse) + ".")
+            return None, None, None
+        return input_matrix_and_tolerance_from_mtx(filename, method_class.supports_multiple_rhs)
+
+    if extension == "bin":
+        matrix, vector_b, tolerance = input_matrix_and_tolerance_from_binary(filename, max_n)
+        if matrix is not None and method_class is IterativeMethod:
+            matrix, vector_b = matrix.tolist(), vector_b.tolist()  # Эталонная реализация работает со списками
+        return matrix, vector_b, tolerance
+
+    return input_matrix_and_tolerance_from_file(filename, max_n, method_class.supports_multiple_rhs)
+
+
+def choose_engine():
+    """
+    Выбор реализации метода.
+    :return: Класс метода и ограничение размерности для него.
+    """
+    while True:
+        engine = input(f"Выберите реализацию метода ({'/'.join(engines)}, по умолчанию list): ").strip().lower() or "list"
+        if engine in engines:
+            return engines[engine]
+        print(f"Неверный выбор, пожалуйста, выберите одно из: {', '.join(engines)}.")
+
+
+def choose_mode():
+    """
+    Выбор режима шага и параметра релаксации.
+    :return: Режим ("jacobi", "seidel", "sor" или "compare") и ω (None - подобрать автоматически).
+    """
+    while True:
+        mode = input(f"Выберите режим ({'/'.join(MODES)}/compare, по умолчанию jacobi): ").strip().lower() or "jacobi"
+        if mode in MODES or mode == "compare":
+            break
+        print(f"Неверный выбор, пожалуйста, выберите одно из: {', '.join(MODES)}, compare.")
+
+    omega = None
+    while mode == "sor":
+        try:
+            value = input("Введите параметр релаксации 0 < ω < 2 (пустая строка - подобрать автоматически): ").strip()
+            if value:
+                omega = float(value)
+                if not 0 < omega < 2:
+                    raise ValueError("Параметр релаксации должен лежать в интервале (0, 2).")
+            break
+        except ValueError as e:
+            print(f"Ошибка: {e}. Попробуйте снова.")
+
+    return mode, omega
+
+
+def compare_modes(method_class, matrix, vector_b, tolerance):
+    """
+    Решение одной и той же системы во всех режимах и вывод числа итераций для сравнения.
+    """
+    print("Режим   | ω      | Итераций")
+    for mode in MODES:
+        # Эталонная реализация переставляет и масштабирует строки на месте, поэтому передаем копии
+        method = method_class([row[:] for row in matrix] if isinstance(matrix, list) else matrix,
+                              list(vector_b), tolerance, mode, history=NoHistory(), **cache_option(method_class))
+        if not method.prepare():
+            print(f"{mode:<7} | -      | на диагонали остались нули")
+            continue
+        _, iterations = method.iterate()
+        print(f"{mode:<7} | {method.omega or 1.0:.4f} | {iterations}" + (" (расходится)" if np.any(method.diverged) else ""))
+
+
+def choose_history():
+    """
+    Выбор политики хранения истории итераций.
+    :return: Объект истории.
+    """
+    while True:
+        policy = input("Сохранять историю итераций? (all/none/last/csv/bin, по умолчанию all): ").strip().lower() or "all"
+        try:
+            if policy == "all":
+                return History()
+            if policy == "none":
+                return NoHistory()
+            if policy == "last":
+                size = int(input("Сколько последних итераций хранить: "))
+                if size <= 0:
+                    raise ValueError("Число итераций должно быть положительным.")
+                return RingHistory(size)
+            if policy in ("csv", "bin"):
+                filename = input("Введите имя файла для записи истории: ").strip()
+                return TraceHistory(filename, binary=policy == "bin")
+            print("Неверный выбор, пожалуйста, выберите 'all', 'none', 'last', 'csv' или 'bin'.")
+        except (ValueError, OSError) as e:
+            print(f"Ошибка: {e}. Попробуйте снова.")
+
+
+def run_method(method_class, matrix, vector_b, tolerance):
+    """
+    Выбор режима и запуск решения.
+    """
+    mode, omega = choose_mode() if len(method_class.sweep_modes) > 1 else (None, None)
+    if mode == "compare":
+        compare_modes(method_class, matrix, vector_b, tolerance)
+    else:
+        with choose_history() as history:
+            method_class(matrix, vector_b, tolerance, mode, omega, history, **cache_option(method_class)).solve()
+
+
+def cache_option(method_class):
+    """
+    Параметр кэша подготовки для реализаций, которые его поддерживают.
+    """
+    return {"cache": preprocess_cache} if method_class.uses_cache else {}
+
+
 def main():
     """
     Основная функция, которая запускает программу.
@@ -211,23 +536,22 @@ def main():
         # Выбор источника ввода
         choice = input("Вы хотите ввести данные из файла или с консоли? (file/console/exit): ").strip().lower()
 
+        if choice in ("file", "console"):
+            method_class, max_n = choose_engine()
+
         if choice == "file":
             filename = input("Введите имя файла: ").strip()
-            matrix, vector_b, tolerance = input_matrix_and_tolerance_from_file(filename)
+            matrix, vector_b, tolerance = read_system_file(filename, method_class, max_n)
             if matrix is None:  # Если произошла ошибка при чтении файла, перезапускаем
                 continue
-            # Создаем объект метода
-            method = IterativeMethod(matrix, vector_b, tolerance)
             # Запускаем решение
-            method.solve()
+            run_method(method_class, matrix, vector_b, tolerance)
             #break  # Выход из цикла после успешного решения
 
         elif choice == "console":
-            matrix, vector_b, tolerance = input_matrix_and_tolerance_from_console()
-            # Создаем объект метода
-            method = IterativeMethod(matrix, vector_b, tolerance)
+            matrix, vector_b, tolerance = input_matrix_and_tolerance_from_console(max_n)
             # Запускаем решение
-            method.solve()
+            run_method(method_class, matrix, vector_b, tolerance)
             #break  # Выход из цикла после успешного решения
 
         elif choice == "exit":
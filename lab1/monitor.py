@@ -0,0 +1,39 @@
+import numpy as np
+
+
+STALL_WINDOW = 50  # Число итераций без уменьшения погрешности, после которого процесс прерывается
+MAX_ITERATIONS = 100_000  # Предельное число итераций
+
+
+class DivergenceMonitor:
+    def __init__(self, window=STALL_WINDOW, max_iterations=MAX_ITERATIONS, columns=1):
+        """
+        Контроль расходимости во время итераций: процесс прерывается, если норма погрешности
+        не уменьшалась window итераций подряд (или стала нечисловой), либо исчерпан лимит итераций.
+        :param window: Длина окна без улучшения.
+        :param max_iterations: Предельное число итераций.
+        :param columns: Число независимо контролируемых правых частей.
+        """
+        self.window = window
+        self.max_iterations = max_iterations
+        self.best = np.full(columns, np.inf)  # Лучшая достигнутая норма погрешности
+        self.best_iteration = np.zeros(columns, dtype=int)  # Итерация, на которой она достигнута
+
+    def stalled(self, iteration, norms, columns=None):
+        """
+        Обновление состояния и проверка остановки.
+        :param iteration: Номер текущей итерации.
+        :param norms: Нормы погрешности (число или массив по столбцам columns).
+        :param columns: Номера контролируемых столбцов (по умолчанию все).
+        :return: Массив признаков остановки для каждого столбца.
+        """
+        if columns is None:
+            columns = np.arange(len(self.best))
+        norms = np.atleast_1d(norms)
+
+        improved = norms < self.best[columns]
+        self.best[columns] = np.where(improved, norms, self.best[columns])
+        self.best_iteration[columns] = np.where(improved, iteration, self.best_iteration[columns])
+
+        return ~np.isfinite(norms) | (iteration - self.best_iteration[columns] >= self.window) \
+            | (iteration >= self.max_iterations)
@@ -0,0 +1,239 @@
+import os
+import sys
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from array_method import ArrayIterativeMethod
+from history import NoHistory
+from monitor import DivergenceMonitor
+
+
+STEP_TIMEOUT = 60.0  # Наибольшее время ожидания ответа рабочего процесса на одном шаге, с
+
+
+def shared_array(shape):
+    """
+    Создание массива float64 в разделяемой памяти.
+    :return: Объект разделяемой памяти и массив поверх нее.
+    """
+    memory = SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    return memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+
+def attach_array(name, shape):
+    """
+    Подключение к уже созданному массиву в разделяемой памяти по имени.
+    """
+    memory = SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+
+def block_jacobi_worker(names, n, start, stop, connection):
+    """
+    Рабочий процесс блочного метода Якоби: обновляет строки [start, stop).
+    Матрица, b, диагональ и оба буфера x лежат в разделяемой памяти и не передаются между процессами;
+    по каналу (Pipe) приходит только номер буфера с текущим x (None - остановка),
+    а в ответ отправляется максимальная погрешность блока.
+    Если главный процесс закрыл канал (завершился), рабочий процесс тоже завершается.
+    """
+    shapes = {"matrix": (n, n), "vector_b": (n,), "diagonal": (n,), "x": (2, n), "errors": (n,)}
+    memories, arrays = [], {}
+    for key, shape in shapes.items():
+        memory, arrays[key] = attach_array(names[key], shape)
+        memories.append(memory)
+
+    matrix = arrays["matrix"][start:stop]
+    vector_b = arrays["vector_b"][start:stop]
+    diagonal = arrays["diagonal"][start:stop]
+
+    try:
+        while True:
+            current = connection.recv()
+            if current is None:
+                break
+            x_old, x_new = arrays["x"][current], arrays["x"][1 - current]
+
+            delta = (vector_b - matrix @ x_old) / diagonal
+            x_new[start:stop] = x_old[start:stop] + delta
+            np.abs(delta, out=arrays["errors"][start:stop])
+            connection.send(float(np.max(arrays["errors"][start:stop], initial=0)))
+    except (EOFError, OSError):
+        pass  # Главный процесс прервал итерации
+    finally:
+        del matrix, vector_b, diagonal, arrays
+        for memory in memories:
+            memory.close()
+        connection.close()
+
+
+class ParallelIterativeMethod(ArrayIterativeMethod):
+    supports_multiple_rhs = False
+    sweep_modes = ("jacobi",)
+
+    def __init__(self, matrix, vector_b, tolerance, mode="jacobi", omega=None, history=None, cache=None,
+                 workers=None):
+        """
+        Блочный метод Якоби в нескольких процессах. Строки подготовленной системы делятся на блоки
+        по числу процессов; матрица один раз копируется в разделяемую память (multiprocessing.shared_memory)
+        и никогда не сериализуется, на каждом шаге процессы обмениваются только вектором x,
+        а проверка сходимости сводится к максимуму из погрешностей блоков.
+        :param matrix: Плотная матрица коэффициентов системы.
+        :param vector_b: Вектор свободных членов.
+        :param tolerance: Точность решения.
+        :param mode: Поддерживается только "jacobi".
+        :param omega: Не используется.
+        :param history: Политика хранения истории итераций (по умолчанию хранится вся история).
+        :param cache: Кэш подготовки матриц (PreprocessCache) или None.
+        :param workers: Число процессов (по умолчанию - число ядер).
+        """
+        super().__init__(matrix, vector_b, tolerance, "jacobi", None, history, cache)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, self.n))
+
+    def summary(self):
+        return f"Режим: блочный jacobi, процессов: {self.workers}"
+
+    def solve(self):
+        """
+        Решение системы уравнений; сбой рабочего процесса выводится как ошибка, а не исключение.
+        """
+        try:
+            return super().solve()
+        except RuntimeError as e:
+            print(f"(!) {e}")
+            return None
+
+    def iterate(self):
+        """
+        Параллельный итерационный процесс.
+        Если рабочий процесс погиб или не ответил за STEP_TIMEOUT, итерации прерываются с RuntimeError;
+        оставшиеся процессы останавливаются, разделяемая память освобождается.
+        :return: Найденное решение и число итераций (история передается в self.history).
+        """
+        memories, arrays = {}, {}
+        shapes = {"matrix": (self.n, self.n), "vector_b": (self.n,), "diagonal": (self.n,), "x": (2, self.n),
+                  "errors": (self.n,)}
+        processes, connections = [], []
+
+        try:
+            for key, shape in shapes.items():
+                memories[key], arrays[key] = shared_array(shape)
+
+            # Переставленная и отмасштабированная матрица копируется в разделяемую память один раз
+            for start, stop in self.row_blocks():
+                rows = self.permutation[start:stop]
+                arrays["matrix"][start:stop] = self.matrix[rows] * self.row_scales[start:stop, None]
+            arrays["vector_b"][:] = self.vector_b
+            arrays["diagonal"][:] = self.diagonal
+            arrays["x"][:] = 0
+
+            names = {key: memory.name for key, memory in memories.items()}
+            bounds = np.linspace(0, self.n, self.workers + 1).astype(int)
+            for worker in range(self.workers):
+                connection, child_connection = Pipe()
+                process = Process(target=block_jacobi_worker,
+                                  args=(names, self.n, bounds[worker], bounds[worker + 1], child_connection))
+                process.start()
+                child_connection.close()
+                processes.append(process)
+                connections.append(connection)
+
+            iterations = 0
+            current = 0
+            monitor = DivergenceMonitor(self.stall_window, self.max_iterations)
+            self.diverged = False
+
+            while True:
+                iterations += 1
+                for connection, process in zip(connections, processes):
+                    try:
+                        connection.send(current)
+                    except OSError:
+                        raise RuntimeError(f"Рабочий процесс {process.pid} закрыл канал, итерации прерваны")
+                error = max(self.collect(connections, processes))
+                current = 1 - current
+
+                self.history.append(iterations, arrays["x"][current], arrays["errors"].copy())
+
+                if error < self.tolerance:
+                    break
+                if monitor.stalled(iterations, error)[0]:
+                    self.diverged = True
+                    break
+
+            solution = arrays["x"][current].copy()
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass  # Процесс уже завершился
+                connection.close()
+            for process in processes:
+                process.join(STEP_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            arrays.clear()
+            for memory in memories.values():
+                memory.close()
+                memory.unlink()
+            self.history.close()
+
+        return solution, iterations
+
+    @staticmethod
+    def collect(connections, processes):
+        """
+        Ожидание погрешностей блоков от всех рабочих процессов на одном шаге.
+        Вместе с каналами ожидаются и сами процессы, поэтому гибель процесса обнаруживается сразу.
+        :return: Погрешности блоков.
+        """
+        errors = {}
+        sentinels = {process.sentinel: process for process in processes}
+        while len(errors) < len(connections):
+            pending = [connection for connection in connections if connection not in errors]
+            ready = wait(pending + list(sentinels), STEP_TIMEOUT)
+            if not ready:
+                raise RuntimeError(f"Шаг не завершился за {STEP_TIMEOUT} с, итерации прерваны")
+            for item in ready:
+                if item in sentinels:
+                    process = sentinels.pop(item)
+                    process.join()
+                    if connections[processes.index(process)] not in errors:
+                        raise RuntimeError(f"Рабочий процесс {process.pid} завершился аварийно "
+                                           f"(код {process.exitcode}), итерации прерваны")
+                else:
+                    try:
+                        errors[item] = item.recv()
+                    except EOFError:
+                        raise RuntimeError("Рабочий процесс закрыл канал, итерации прерваны")
+        return list(errors.values())
+
+
+def benchmark(n=4000, tolerance=1e-10):
+    """
+    Сравнение времени решения большой плотной системы при разном числе процессов.
+    Для честного сравнения многопоточность BLAS нужно отключить (OMP_NUM_THREADS=1).
+    """
+    rng = np.random.default_rng(0)
+    matrix = rng.random((n, n)) + np.diag(np.full(n, float(n)))
+    vector_b = rng.random(n)
+
+    base_time = None
+    print("Процессов | Итераций | Время, с | Ускорение")
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        method = ParallelIterativeMethod(matrix, vector_b, tolerance, history=NoHistory(), workers=workers)
+        method.prepare()
+        start = time.perf_counter()
+        _, iterations = method.iterate()
+        elapsed = time.perf_counter() - start
+        base_time = base_time or elapsed
+        print(f"{workers} | {iterations} | {elapsed:.3f} | {base_time / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,138 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix, issparse
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+
+ROW_BLOCK = 1024  # Число строк, обрабатываемых за раз при поблочных проходах по плотной матрице
+DENSE_ASSIGNMENT_LIMIT = 1000  # До этого размера задача о назначениях для плотной матрицы решается по всем элементам
+CANDIDATES = 16  # Число наибольших по модулю элементов строки - кандидатов на диагональ в большой плотной матрице
+
+
+def row_statistics(matrix):
+    """
+    Суммы модулей строк, максимальные по модулю элементы строк и номера их столбцов.
+    Для плотной матрицы считается поблочно, для разреженной - за O(nnz).
+    """
+    if issparse(matrix):
+        absolute = abs(csr_matrix(matrix))
+        sums = np.asarray(absolute.sum(axis=1)).ravel()
+        maxima = absolute.max(axis=1).toarray().ravel()
+        columns = np.asarray(absolute.argmax(axis=1)).ravel()
+        return sums, maxima, columns
+
+    n = matrix.shape[0]
+    sums, maxima = np.empty(n), np.empty(n)
+    columns = np.empty(n, dtype=int)
+    for start in range(0, n, ROW_BLOCK):
+        block = np.abs(matrix[start:start + ROW_BLOCK])
+        sums[start:start + ROW_BLOCK] = block.sum(axis=1)
+        columns[start:start + ROW_BLOCK] = block.argmax(axis=1)
+        maxima[start:start + ROW_BLOCK] = block[np.arange(block.shape[0]), columns[start:start + ROW_BLOCK]]
+    return sums, maxima, columns
+
+
+def strict_dominant_permutation(sums, maxima, columns):
+    """
+    Поиск перестановки строк со строгим диагональным преобладанием.
+    Строка может стоять на месте j только если 2|a_ij| > сумма модулей строки, а это возможно
+    лишь для одного столбца - столбца ее максимального элемента. Поэтому перестановка
+    существует тогда и только тогда, когда у всех строк такой столбец есть и все они различны.
+    :return: Перестановка (permutation[j] - номер строки на месте j) или None.
+    """
+    n = len(sums)
+    if not np.all(2 * maxima > sums):
+        return None
+    if not np.all(np.bincount(columns, minlength=n) == 1):
+        return None
+
+    permutation = np.empty(n, dtype=int)
+    permutation[columns] = np.arange(n)
+    return permutation
+
+
+def candidate_weights(matrix, sums, count=CANDIDATES):
+    """
+    Веса задачи о назначениях 3 - 2|a_ij| / S_i только для кандидатов на диагональ: count наибольших
+    по модулю элементов каждой строки и ее диагонального элемента (если он не ноль), чтобы исходный
+    порядок строк тоже был допустимым назначением. Плотная матрица читается блоками строк.
+    :return: Разреженная (CSR) матрица весов n×n с count + 1 элементами в строке.
+    """
+    n = matrix.shape[0]
+    count = min(count, n)
+    rows, columns = [], []
+    for start in range(0, n, ROW_BLOCK):
+        block = np.abs(matrix[start:start + ROW_BLOCK])
+        index = np.arange(block.shape[0])
+        top = np.argpartition(block, n - count, axis=1)[:, n - count:]
+        rows.append(np.concatenate([np.repeat(index, count), index]) + start)
+        columns.append(np.concatenate([top.ravel(), index + start]))
+    rows, columns = np.concatenate(rows), np.concatenate(columns)
+
+    # Диагональный элемент может уже быть среди наибольших: повторы убираются, иначе CSR сложит веса
+    rows, columns = np.divmod(np.unique(rows * n + columns), n)
+    values = np.abs(matrix[rows, columns])
+    nonzero = values != 0
+    rows, columns, values = rows[nonzero], columns[nonzero], values[nonzero]
+    return csr_matrix((3 - 2 * values / sums[rows], (rows, columns)), shape=(n, n))
+
+
+def assignment_permutation(matrix, sums):
+    """
+    Перестановка, максимизирующая суммарный относительный запас преобладания
+    2|a_ij| / S_i - 1 по всем строкам (задача о назначениях). Нулевые элементы на
+    диагональ не ставятся. Для разреженной матрицы используется паросочетание
+    минимального веса по ненулевым элементам, для плотной до DENSE_ASSIGNMENT_LIMIT строк -
+    венгерский алгоритм за O(n³). Для большей плотной матрицы паросочетание ищется только
+    среди кандидатов (см. candidate_weights): результат оптимален среди них, но не обязательно
+    среди всех перестановок. Если кандидатов не хватило, решается полная задача.
+    :return: Перестановка или None, если ненулевую диагональ получить нельзя.
+    """
+    sums = np.where(sums != 0, sums, 1)
+    try:
+        if issparse(matrix):
+            # Вес 3 - 2|a_ij| / S_i лежит в [1, 3]: положительный, чтобы ребро не пропало из графа
+            weights = abs(csr_matrix(matrix))
+            weights = weights.multiply(-2 / sums[:, None]).tocsr()
+            weights.data += 3
+            rows, columns = min_weight_full_bipartite_matching(weights)
+        else:
+            rows, columns = dense_assignment(matrix, sums)
+    except ValueError:
+        return None
+
+    permutation = np.empty(len(rows), dtype=int)
+    permutation[columns] = rows
+    return permutation
+
+
+def dense_assignment(matrix, sums):
+    """
+    Задача о назначениях для плотной матрицы (см. assignment_permutation).
+    :return: Номера строк и назначенных им столбцов.
+    """
+    if matrix.shape[0] > DENSE_ASSIGNMENT_LIMIT:
+        try:
+            return min_weight_full_bipartite_matching(candidate_weights(matrix, sums))
+        except ValueError:
+            pass  # Среди кандидатов полного паросочетания нет - решается полная задача
+
+    cost = 1 - 2 * np.abs(matrix) / sums[:, None]
+    cost[matrix == 0] = np.inf
+    return linear_sum_assignment(cost)
+
+
+def find_dominant_permutation(matrix):
+    """
+    Поиск перестановки строк для диагонального преобладания.
+    Сначала за O(nnz) проверяется, достижимо ли строгое преобладание; если нет -
+    решается задача о назначениях, чтобы диагональ была как можно более весомой.
+    :param matrix: Плотная (ndarray) или разреженная матрица.
+    :return: Перестановка строк (None, если ненулевую диагональ получить нельзя)
+             и признак достигнутого строгого преобладания.
+    """
+    sums, maxima, columns = row_statistics(matrix)
+    permutation = strict_dominant_permutation(sums, maxima, columns)
+    if permutation is not None:
+        return permutation, True
+    return assignment_permutation(matrix, sums), False
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import issparse
+
+from permutation import ROW_BLOCK
+
+
+CACHE_SIZE = 32  # Число подготовленных матриц, хранящихся в памяти
+FIELDS = ("permutation", "row_scales", "diagonal", "dominant", "spectral_radius")  # Содержимое записи кэша
+
+
+def matrix_fingerprint(matrix):
+    """
+    Хэш содержимого матрицы (SHA-256, на большинстве процессоров вычисляется аппаратно).
+    Плотная матрица читается блоками строк, поэтому для отображенной в память матрицы не создается копия целиком.
+    :param matrix: Плотная (ndarray) или разреженная (CSR) матрица float64.
+    :return: Шестнадцатеричная строка хэша.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((type(matrix).__name__, matrix.shape)).encode())
+    if issparse(matrix):
+        for part in (matrix.indptr, matrix.indices, matrix.data):
+            digest.update(np.ascontiguousarray(part).tobytes())
+        return digest.hexdigest()
+
+    for start in range(0, matrix.shape[0], ROW_BLOCK):
+        digest.update(np.ascontiguousarray(matrix[start:start + ROW_BLOCK]).tobytes())
+    return digest.hexdigest()
+
+
+class PreprocessCache:
+    def __init__(self, size=CACHE_SIZE, directory=None):
+        """
+        Кэш подготовки матрицы: перестановка строк, множители строк, диагональ после масштабирования
+        (то есть расщепление A = D + (A - D) для итераций), признак преобладания и оценка спектрального радиуса.
+        Записи хранятся в памяти с вытеснением давно не использованных (LRU)
+        и, если задан каталог, дублируются на диск файлами <хэш>.npz, чтобы переживать перезапуск программы.
+        :param size: Максимальное число записей в памяти.
+        :param directory: Каталог для записей на диске (None - только в памяти).
+        """
+        self.size = size
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0  # Число обращений, обслуженных из кэша
+        self.misses = 0  # Число обращений, потребовавших подготовки матрицы
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """
+        Запись для матрицы с данным хэшем.
+        :return: Словарь с полями FIELDS или None, если матрица еще не подготавливалась.
+        """
+        entry = self.entries.get(key)
+        if entry is None and self.directory is not None and os.path.exists(self.path(key)):
+            with np.load(self.path(key)) as data:
+                entry = {field: data[field] for field in FIELDS}
+            entry["dominant"] = bool(entry["dominant"])
+            radius = float(entry["spectral_radius"])
+            entry["spectral_radius"] = None if np.isnan(radius) else radius
+            self.remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Сохранение (или обновление) записи в памяти и на диске.
+        """
+        self.remember(key, entry)
+        if self.directory is None:
+            return
+
+        # Запись через временный файл: кэш на диске может одновременно читаться другими процессами
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+        with os.fdopen(descriptor, "wb") as file:
+            np.savez(file, **{field: entry[field] for field in FIELDS if field != "spectral_radius"},
+                     spectral_radius=np.nan if entry["spectral_radius"] is None else entry["spectral_radius"])
+        os.replace(temporary, self.path(key))
+
+    def remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def describe(self):
+        """
+        Строка со статистикой кэша для вывода.
+        """
+        return f"Кэш подготовки матриц: попаданий {self.hits}, промахов {self.misses}"
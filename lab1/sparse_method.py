@@ -0,0 +1,47 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from array_method import ArrayIterativeMethod
+
+
+class SparseIterativeMethod(ArrayIterativeMethod):
+    """
+    Метод простых итераций для разреженной матрицы в формате CSR.
+    Все проходы по матрице (проверка преобладания, масштабирование, итерации, невязка)
+    выполняются за O(nnz), матрица размера n×n никогда не создается.
+    Перестановка строк ищется паросочетанием по ненулевым элементам (см. permutation.py).
+    """
+    accepts_sparse = True
+
+    @staticmethod
+    def as_matrix(matrix):
+        """
+        Приведение матрицы к формату CSR.
+        """
+        return csr_matrix(matrix, dtype=np.float64)
+
+    def row_abs_sums(self):
+        """
+        Суммы модулей элементов каждой строки исходной матрицы.
+        """
+        return np.asarray(abs(self.matrix).sum(axis=1)).ravel()
+
+    def row_abs_max(self):
+        """
+        Максимальные по модулю элементы каждой строки исходной матрицы.
+        """
+        return abs(self.matrix).max(axis=1).toarray().ravel()
+
+    def permuted_diagonal(self):
+        """
+        Диагональ матрицы с учетом текущей перестановки строк (без масштабирования).
+        """
+        return np.asarray(self.matrix[self.permutation, np.arange(self.n)]).ravel()
+
+    def row_dot(self, row, x):
+        """
+        Скалярное произведение строки исходной матрицы на вектор x по ее ненулевым элементам.
+        :param row: Номер строки в исходной матрице.
+        """
+        start, stop = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        return self.matrix.data[start:stop] @ x[self.matrix.indices[start:stop]]
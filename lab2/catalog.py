@@ -0,0 +1,28 @@
+from dto.equation import Equation  # Импорт класса уравнения
+from methods.half_division import HalfDivisionMethod  # Метод половинного деления
+from methods.newton import NewtonMethod  # Метод Ньютона
+from methods.simple_iterations import SimpleIterationsMethod  # Метод простых итераций
+from methods.chord import ChordMethod  # Метод хорд
+from methods.brent import BrentMethod  # Метод Брента
+from methods.modified_chord import IllinoisMethod, AndersonBjorckMethod  # Модифицированные методы хорд
+
+# Словарь доступных методов решения
+methods = {
+    1: HalfDivisionMethod,
+    2: ChordMethod,
+    3: SimpleIterationsMethod,
+    4: NewtonMethod,
+    5: BrentMethod,
+    6: IllinoisMethod,
+    7: AndersonBjorckMethod,
+}
+
+# Предопределенные уравнения: текст выражения компилируется в функцию на NumPy (см. expression.py)
+predefined_functions = {
+    1: Equation.from_text('-1.38*x^3 - 5.42*x^2 + 2.57*x + 10.95'),
+    2: Equation.from_text('x^3 - 1.89*x^2 - 2*x + 1.76'),
+    # Источник функции: https://cutt.ly/6zNbCha
+    3: Equation.from_text('x/2 - 2*(x + 2.39)^(1/3)'),
+    # Источник функции: https://cutt.ly/MzNdHH5
+    4: Equation.from_text('-x/2 + e^x + 5*sin(x)'),
+}
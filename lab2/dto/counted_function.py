@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+import numpy as np
+
+from dual import value_and_derivative
+
+
+CACHE_SIZE = 8  # Число последних точек, значения в которых запоминаются
+DX = 0.00001  # Шаг центральной разности, если функцию нельзя продифференцировать автоматически
+
+
+class CountedFunction:
+    """
+    Обертка над функцией уравнения: запоминает значения в последних точках
+    и считает, сколько раз функция действительно вычислялась.
+    Производная вычисляется автоматически (дуальными числами) вместе со значением за один вызов.
+    """
+
+    def __init__(self, function: Callable, cache_size: int = CACHE_SIZE):
+        self.function = function
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.slopes = OrderedDict()  # Производные в последних точках
+        self.evaluations = 0  # Число вызовов исходной функции
+        self.dual = value_and_derivative(function)
+        self.automatic = True  # Удается ли дифференцировать функцию автоматически
+
+    def __call__(self, x):
+        if isinstance(x, np.ndarray):
+            # Массив точек не кэшируется, но каждая точка учитывается
+            self.evaluations += x.size
+            return self.function(x)
+
+        if x in self.cache:
+            self.cache.move_to_end(x)
+            return self.cache[x]
+
+        value = self.function(x)
+        self.evaluations += 1
+        self.remember(x, value)
+        return value
+
+    def with_derivative(self, x) -> Tuple[float, float]:
+        """
+        Значение функции и ее производной в точке x.
+        Обычно это один вызов функции с дуальным числом; если функция его не поддерживает
+        (например, приводит аргумент к float), производная считается центральной разностью.
+        """
+        if x in self.slopes and x in self.cache:
+            self.slopes.move_to_end(x)
+            return self(x), self.slopes[x]
+
+        if self.automatic:
+            try:
+                value, slope = self.dual(x)
+                self.evaluations += 1
+                self.remember(x, value)
+            except TypeError:
+                self.automatic = False
+        if not self.automatic:
+            value, slope = self(x), (self(x + DX) - self(x - DX)) / (2 * DX)
+
+        self.slopes[x] = slope
+        if len(self.slopes) > self.cache_size:
+            self.slopes.popitem(last=False)
+        return value, slope
+
+    def derivative(self, x) -> float:
+        return self.with_derivative(x)[1]
+
+    def derivatives(self, x: np.ndarray) -> np.ndarray:
+        """
+        Производная сразу во всех точках массива x: один вызов функции с дуальным числом,
+        значение которого - массив. Если так нельзя, производные считаются по точкам.
+        """
+        x = np.asarray(x, dtype=float)
+        if self.automatic:
+            try:
+                _, slopes = self.dual(x)
+                self.evaluations += x.size
+                return np.broadcast_to(np.asarray(slopes, dtype=float), x.shape)
+            except (TypeError, ValueError):
+                pass  # Функция не принимает массивы (или дуальные числа) - по точкам
+        return np.array([self.derivative(float(point)) for point in x])
+
+    def remember(self, x, value):
+        self.cache[x] = value
+        self.cache.move_to_end(x)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
@@ -1,19 +1,42 @@
 from typing import Callable
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.misc import derivative
 
+from dto.counted_function import CountedFunction
+from expression import Expression
 
-dx = 0.00001
 
 class Equation:
     def __init__(self, function: Callable, text: str):
         self.text = text
         self.function = function
 
+    @classmethod
+    def from_text(cls, text: str) -> 'Equation':
+        """
+        Уравнение из текстовой записи функции, например '-x/2 + e^x + 5*sin(x)' (см. expression.py).
+        :raises ValueError: Если запись содержит недопустимые конструкции.
+        """
+        return cls(Expression(text), text)
+
+    def values(self, x: np.ndarray, *parameters) -> np.ndarray:
+        """
+        Значения функции на массиве точек. Функции, записанные через операции NumPy,
+        вычисляются одним вызовом; функции с math.sin и т.п. - поэлементно через np.vectorize.
+        :param parameters: Массивы параметров той же формы, что и x, для функций вида f(x, p, ...).
+        """
+        x = np.asarray(x, dtype=float)
+        try:
+            y = np.asarray(self.function(x, *parameters), dtype=float)
+            if y.shape == x.shape:
+                return y
+        except TypeError:
+            pass
+        return np.vectorize(self.function, otypes=[float])(x, *parameters)
+
     def draw(self, left: float, right: float):
         x = np.linspace(left, right)
-        func = np.vectorize(self.function)(x)
+        func = self.values(x)
 
         plt.title = 'График заданной функции'
         plt.grid(True, which='both')
@@ -25,6 +48,7 @@ class Equation:
         plt.savefig('graph.png')
         plt.show()
 
-    def root_exists(self, left: float, right: float):
-        return (self.function(left) * self.function(right) < 0) \
-               and (derivative(self.function, left, dx) * derivative(self.function, left, dx) > 0)
+    def root_exists(self, left: float, right: float, function: CountedFunction = None):
+        f = function or CountedFunction(self.function)
+        return (f(left) * f(right) < 0) \
+               and (f.derivative(left) * f.derivative(right) > 0)
@@ -7,9 +7,15 @@ class Result:
     function_value_at_root: float
     iterations: int
     decimal_places: int
+    evaluations: int = 0
+    converged: bool = True  # Достигнута ли заданная точность (False - метод остановлен по ограничению)
 
     def __str__(self):
-        return 'Результат:\n' \
+        text = 'Результат:\n' \
                f'Найденный корень уравнения: {round(self.root, self.decimal_places)}\n' \
                f'Значение функции в корне: {self.function_value_at_root}\n' \
-               f'Число итераций: {self.iterations}'
+               f'Число итераций: {self.iterations}\n' \
+               f'Число вычислений функции: {self.evaluations}'
+        if not self.converged:
+            text += '\n(!) Заданная точность не достигнута'
+        return text
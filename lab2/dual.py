@@ -0,0 +1,248 @@
+import cmath
+import math
+import types
+from typing import Callable, Tuple
+
+import numpy as np
+
+
+class Dual:
+    """
+    Дуальное число value + derivative·ε (ε² = 0). Вычисление функции от Dual(x, 1)
+    за один проход дает и значение f(x), и производную f'(x) (прямой режим автоматического дифференцирования).
+    """
+    __slots__ = ('value', 'derivative')
+
+    def __init__(self, value, derivative=0.0):
+        self.value = value
+        self.derivative = derivative
+
+    @staticmethod
+    def lift(other):
+        return other if isinstance(other, Dual) else Dual(other)
+
+    def __add__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value + other.value, self.derivative + other.derivative)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value - other.value, self.derivative - other.derivative)
+
+    def __rsub__(self, other):
+        return Dual.lift(other) - self
+
+    def __mul__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value * other.value, self.derivative * other.value + self.value * other.derivative)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value / other.value,
+                    (self.derivative * other.value - self.value * other.derivative) / other.value ** 2)
+
+    def __rtruediv__(self, other):
+        return Dual.lift(other) / self
+
+    def __pow__(self, power):
+        if not isinstance(power, Dual):
+            # Постоянный показатель: (u^p)' = p·u^(p-1)·u'
+            if power == 0:
+                return Dual(1.0)
+            return Dual(self.value ** power, power * self.value ** (power - 1) * self.derivative)
+        # Общий случай: (u^v)' = u^v·(v'·ln u + v·u'/u)
+        value = self.value ** power.value
+        return Dual(value, value * (power.derivative * log(self.value) + power.value * self.derivative / self.value))
+
+    def __rpow__(self, base):
+        # Постоянное основание (например, math.e ** x): (a^u)' = a^u·ln a·u'
+        value = base ** self.value
+        return Dual(value, value * log(base) * self.derivative)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.derivative)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.value), np.sign(self.value) * self.derivative)
+
+    def __eq__(self, other):
+        return self.value == Dual.lift(other).value
+
+    def __lt__(self, other):
+        return self.value < Dual.lift(other).value
+
+    def __le__(self, other):
+        return self.value <= Dual.lift(other).value
+
+    def __gt__(self, other):
+        return self.value > Dual.lift(other).value
+
+    def __ge__(self, other):
+        return self.value >= Dual.lift(other).value
+
+    __hash__ = None
+
+    def __float__(self):
+        # Явный запрет: иначе math.* и float() молча отбросили бы производную
+        raise TypeError('Дуальное число нельзя привести к float без потери производной')
+
+    def __repr__(self):
+        return f'Dual({self.value!r}, {self.derivative!r})'
+
+    # Методы, которые вызывают функции NumPy (np.sin(x) для объекта x вызывает x.sin())
+    def sin(self):
+        return sin(self)
+
+    def cos(self):
+        return cos(self)
+
+    def tan(self):
+        return tan(self)
+
+    def exp(self):
+        return exp(self)
+
+    def log(self):
+        return log(self)
+
+    def sqrt(self):
+        return sqrt(self)
+
+    def arcsin(self):
+        return asin(self)
+
+    def arccos(self):
+        return acos(self)
+
+    def arctan(self):
+        return atan(self)
+
+    def log10(self):
+        return log10(self)
+
+    def cbrt(self):
+        return cbrt(self)
+
+    def sinh(self):
+        return sinh(self)
+
+    def cosh(self):
+        return cosh(self)
+
+    def tanh(self):
+        return tanh(self)
+
+
+def elementary(function: Callable, derivative: Callable) -> Callable:
+    """
+    Элементарная функция, принимающая и обычные числа, и дуальные: f(u)' = f'(u)·u'.
+    """
+    def apply(x):
+        if isinstance(x, Dual):
+            return Dual(function(x.value), derivative(x.value) * x.derivative)
+        return function(x)
+    return apply
+
+
+def dispatch(real: Callable, complex_: Callable, array: Callable) -> Callable:
+    """
+    Функция, выбирающая реализацию по типу аргумента: math для чисел, cmath для комплексных чисел
+    (как у степеней с дробным показателем от отрицательных чисел), NumPy для массивов.
+    """
+    def apply(x):
+        if isinstance(x, np.ndarray):
+            return array(x)
+        if isinstance(x, complex):
+            return complex_(x)
+        return real(x)
+    return apply
+
+
+_sin = dispatch(math.sin, cmath.sin, np.sin)
+_cos = dispatch(math.cos, cmath.cos, np.cos)
+_exp = dispatch(math.exp, cmath.exp, np.exp)
+_sqrt = dispatch(math.sqrt, cmath.sqrt, np.sqrt)
+_cosh = dispatch(math.cosh, cmath.cosh, np.cosh)
+_cbrt = dispatch(math.cbrt, math.cbrt, np.cbrt)
+
+sin = elementary(_sin, _cos)
+cos = elementary(_cos, lambda x: -_sin(x))
+tan = elementary(dispatch(math.tan, cmath.tan, np.tan), lambda x: 1 / _cos(x) ** 2)
+exp = elementary(_exp, _exp)
+sqrt = elementary(_sqrt, lambda x: 0.5 / _sqrt(x))
+asin = elementary(dispatch(math.asin, cmath.asin, np.arcsin), lambda x: 1 / _sqrt(1 - x ** 2))
+acos = elementary(dispatch(math.acos, cmath.acos, np.arccos), lambda x: -1 / _sqrt(1 - x ** 2))
+atan = elementary(dispatch(math.atan, cmath.atan, np.arctan), lambda x: 1 / (1 + x ** 2))
+sinh = elementary(dispatch(math.sinh, cmath.sinh, np.sinh), _cosh)
+cosh = elementary(_cosh, dispatch(math.sinh, cmath.sinh, np.sinh))
+tanh = elementary(dispatch(math.tanh, cmath.tanh, np.tanh), lambda x: 1 / _cosh(x) ** 2)
+fabs = elementary(dispatch(math.fabs, abs, np.abs), np.sign)
+cbrt = elementary(_cbrt, lambda x: 1 / (3 * _cbrt(x) ** 2))
+_ln = elementary(dispatch(math.log, cmath.log, np.log), lambda x: 1 / x)
+
+
+def log(x, base=None):
+    if base is None:
+        return _ln(x)
+    return _ln(x) / _ln(base)
+
+
+def log10(x):
+    return log(x, 10)
+
+
+def log2(x):
+    return log(x, 2)
+
+
+def power(x, y):
+    return x ** y
+
+
+# Замена модуля math для функций пользователя: те же имена, но с поддержкой Dual
+dual_math = types.SimpleNamespace(**{name: getattr(math, name) for name in dir(math) if not name.startswith('_')})
+for _name, _function in dict(sin=sin, cos=cos, tan=tan, exp=exp, sqrt=sqrt, asin=asin, acos=acos, atan=atan,
+                             sinh=sinh, cosh=cosh, tanh=tanh, fabs=fabs, cbrt=cbrt, log=log, log10=log10, log2=log2,
+                             pow=power).items():
+    setattr(dual_math, _name, _function)
+
+
+def with_dual_math(function: Callable) -> Callable:
+    """
+    Копия функции пользователя, в которой модуль math (и импортированные из него функции)
+    заменены версиями, принимающими дуальные числа. Сама функция не изменяется.
+    """
+    code = getattr(function, '__code__', None)
+    if code is None:
+        return function
+
+    namespace = dict(function.__globals__)
+    for name, value in function.__globals__.items():
+        if value is math:
+            namespace[name] = dual_math
+        elif getattr(value, '__module__', None) == 'math' and hasattr(dual_math, getattr(value, '__name__', '')):
+            namespace[name] = getattr(dual_math, value.__name__)
+    return types.FunctionType(code, namespace, function.__name__, function.__defaults__, function.__closure__)
+
+
+def value_and_derivative(function: Callable) -> Callable[[float], Tuple[float, float]]:
+    """
+    Функция x -> (f(x), f'(x)), вычисляющая обе величины одним вызовом функции пользователя.
+    x может быть и числом, и массивом NumPy (тогда производные считаются сразу во всех точках).
+    Если функция не поддерживает дуальные числа, при вызове возникает TypeError.
+    """
+    dual_function = with_dual_math(function)
+
+    def evaluate(x):
+        y = dual_function(Dual(x, 1.0))
+        if isinstance(y, Dual):
+            return y.value, y.derivative
+        return y, 0.0  # Функция не зависит от x
+    return evaluate
@@ -1,7 +1,21 @@
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import cycle
 from math import sqrt
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.linalg import det
+from scipy.linalg import LinAlgWarning, lu_factor, lu_solve
+from scipy.stats import qmc
+
+MODES = ("newton", "frozen", "broyden")  # Режимы метода Ньютона для систем
+FROZEN_STEPS = 5  # Число итераций с одним LU-разложением в режиме frozen
+BROYDEN_UPDATES = 50  # Число обновлений Бройдена до нового вычисления матрицы Якоби
+MAX_PRINTED = 6  # Сколько компонент решения выводить в строке итерации
+GRID_CACHE_SIZE = 8  # Число сеток для графиков, хранящихся в памяти
+PLOT_COLORS = ('r', 'b', 'g', 'm')  # Цвета линий уравнений системы на графике
+MULTISTART_POINTS = 256  # Число начальных приближений в многостартовом методе Ньютона
+DIVERGENCE_BOUND = 1e8  # Приближения дальше этой границы считаются расходящимися
 
 def a(xy):
     """ Система уравнений """
@@ -19,59 +33,269 @@ def jacobian(xy):
         [2*x, -1]
     ])
 
-def newton_method(a, jacobian, x0, epsilon=1e-6, max_iterations=100):
-    """ Метод Ньютона """
+@dataclass
+class SystemStats:
+    """ Затраты на решение системы """
+    function_evaluations: int = 0  # Вычисления вектора F (включая разностную матрицу Якоби)
+    jacobian_evaluations: int = 0  # Вычисления матрицы Якоби (аналитической или разностной)
+    factorizations: int = 0  # LU-разложения матрицы Якоби
+
+    def __str__(self):
+        return (f"Вычислений F: {self.function_evaluations}, вычислений матрицы Якоби: {self.jacobian_evaluations}, "
+                f"LU-разложений: {self.factorizations}")
+
+
+def finite_difference_jacobian(a, x, fx, stats):
+    """ Матрица Якоби по правым разностям: n дополнительных вычислений F """
+    jacobian = np.empty((len(fx), len(x)))
+    for j in range(len(x)):
+        h = sqrt(np.finfo(float).eps) * max(abs(x[j]), 1.0)
+        shifted = x.copy()
+        shifted[j] += h
+        jacobian[:, j] = (a(shifted) - fx) / h
+    stats.function_evaluations += len(x)
+    return jacobian
+
+
+def factorize(a, jacobian, x, fx, stats):
+    """ Вычисление матрицы Якоби в точке x и ее LU-разложение (None, если матрица вырождена) """
+    J = np.asarray(jacobian(x), dtype=float) if jacobian is not None else finite_difference_jacobian(a, x, fx, stats)
+    stats.jacobian_evaluations += 1
+    stats.factorizations += 1
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", LinAlgWarning)
+        lu, pivots = lu_factor(J)
+    if not np.all(np.isfinite(lu)) or np.any(np.abs(np.diag(lu)) <= np.finfo(float).eps * np.abs(lu).max()):
+        return None
+    return lu, pivots
+
+
+def newton_method(a, jacobian, x0, epsilon=1e-6, max_iterations=100, mode="newton",
+                  refresh=FROZEN_STEPS, log=True):
+    """
+    Метод Ньютона для системы из N уравнений F(x) = 0.
+    Режимы:
+        newton - матрица Якоби вычисляется и раскладывается (LU) на каждой итерации;
+        frozen - одно LU-разложение используется refresh итераций подряд (упрощенный метод Ньютона),
+                 раньше обновляется, если норма F перестала уменьшаться;
+        broyden - квазиньютоновский метод Бройдена: после первого разложения матрица Якоби
+                  не вычисляется, а уточняется обновлениями ранга 1 (хранятся как произведение, O(kN) на шаг).
+    Если jacobian = None, матрица Якоби считается по конечным разностям.
+    Возвращает решение (None, если метод не сошелся), число итераций и затраты (SystemStats).
+    """
     x = np.array(x0, dtype=float)
+    stats = SystemStats()
+    F = np.asarray(a(x), dtype=float)
+    stats.function_evaluations += 1
+
+    factors = None
+    age = 0  # Число итераций с текущим разложением
+    updates = []  # Обновления Бройдена: H_k+1 = (I + u v^T) H_k
+    last_norm = np.inf
 
     for iteration in range(max_iterations):
-        J = jacobian(x)
-        F = a(x)
+        if factors is None or mode == "newton" or (mode == "frozen" and (age >= refresh or np.linalg.norm(F) >= last_norm)):
+            factors = factorize(a, jacobian, x, F, stats)
+            age = 0
+            updates = []
+            if factors is None:
+                print(f"(!) Метод Ньютона не работает при начальном приближении x={x}. Матрица Якоби вырождена (определитель = 0).")
+                print("Попробуйте выбрать другое начальное приближение gо x(строго не равное нулю(может быть близким к нему))")
+                return None, None, stats
 
-        try:
-            delta_x = np.linalg.solve(J, -F)  # Решаем J * Δx = -F
-        except np.linalg.LinAlgError:
-            print(f"(!) Метод Ньютона не работает при начальном приближении x=0. Матрица Якоби вырождена (определитель = 0).")
-            print("Попробуйте выбрать другое начальное приближение gо x(строго не равное нулю(может быть близким к нему))")
-            return None, None
+        # Решаем J * Δx = -F
+        delta_x = lu_solve(factors, -F)
+        for u, v in updates:
+            delta_x += u * (v @ delta_x)
+        age += 1
 
         x_next = x + delta_x
+        F_next = np.asarray(a(x_next), dtype=float)
+        stats.function_evaluations += 1
 
-        print(f"{iteration}. x = ({x_next[0]:.6f}, {x_next[1]:.6f}), ||dx|| = {np.linalg.norm(delta_x):.2e}")
+        if log:
+            print(f"{iteration}. x = ({', '.join(f'{value:.6f}' for value in x_next[:MAX_PRINTED])}"
+                  f"{', ...' if len(x_next) > MAX_PRINTED else ''}), ||dx|| = {np.linalg.norm(delta_x):.2e}")
 
+        if not np.all(np.isfinite(x_next)):
+            break
         if np.linalg.norm(delta_x) < epsilon:
-            return x_next, iteration + 1
+            return x_next, iteration + 1, stats
 
-        x = x_next
+        if mode == "broyden":
+            # Обновление обратной матрицы по формуле Шермана-Моррисона:
+            # H_k+1 = H_k + (s - H_k y) s^T H_k / (s^T H_k y), s = Δx, y = ΔF
+            h_y = lu_solve(factors, F_next - F)
+            for u, v in updates:
+                h_y += u * (v @ h_y)
+            denominator = delta_x @ h_y
+            if abs(denominator) > np.finfo(float).eps * np.linalg.norm(delta_x) * np.linalg.norm(h_y) \
+                    and len(updates) < BROYDEN_UPDATES:
+                updates.append(((delta_x - h_y) / denominator, delta_x))
+            else:
+                factors = None  # Обновление неустойчиво или их накопилось много - новое разложение
+
+        last_norm = np.linalg.norm(F)
+        x, F = x_next, F_next
 
     print("Метод Ньютона не сошелся!")
-    return None, None
+    return None, None, stats
 
-def plot_system(system):
-    """ Построение графиков уравнений """
-    x = np.linspace(-2, 2, 400)
-    y = np.linspace(-2, 2, 400)
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def system_grid(system, left=-2, right=2, points=400):
+    """ Значения уравнений системы на сетке points×points (кэшируются для каждой системы и окна) """
+    x = np.linspace(left, right, points)
+    y = np.linspace(left, right, points)
     X, Y = np.meshgrid(x, y)
 
-    Z1 = np.array([system([x_, y_])[0] for x_, y_ in zip(np.ravel(X), np.ravel(Y))]).reshape(X.shape)
-    Z2 = np.array([system([x_, y_])[1] for x_, y_ in zip(np.ravel(X), np.ravel(Y))]).reshape(X.shape)
+    # Система, записанная через операции NumPy, вычисляется на всей сетке одним вызовом
+    try:
+        Z = np.asarray(system(np.array([X, Y])), dtype=float)
+    except (TypeError, ValueError):
+        Z = None
+    if Z is None or Z.shape[1:] != X.shape:
+        Z = np.array([system([x_, y_]) for x_, y_ in zip(np.ravel(X), np.ravel(Y))]).T.reshape(-1, *X.shape)
+    return X, Y, Z
 
+
+def plot_system(system, left=-2, right=2, points=400):
+    """ Построение графиков уравнений """
     if input("Показать график системы(y - да, любой другой символ или пустая строка - нет):") == "y":
-        plt.contour(X, Y, Z1, levels=[0], colors='r')
-        plt.contour(X, Y, Z2, levels=[0], colors='b')
+        X, Y, Z = system_grid(system, left, right, points)
+        for Z_i, color in zip(Z, cycle(PLOT_COLORS)):
+            plt.contour(X, Y, Z_i, levels=[0], colors=color)
         plt.xlabel('x')
         plt.ylabel('y')
         plt.grid()
         plt.show()
 
+
+@dataclass
+class SystemRoot:
+    """ Решение системы, найденное многостартовым методом Ньютона """
+    point: np.ndarray
+    starts: int  # Сколько начальных приближений сошлись к этому решению
+    iterations: int  # Наименьшее число итераций среди них
+    residual: float  # Норма невязки ||F(x)||
+
+
+def batch_values(system, X):
+    """ Значения системы в точках X (m×n) одним векторным вызовом или, если нельзя, по точкам """
+    try:
+        F = np.asarray(system(X.T), dtype=float)
+        if F.shape[1:] == (len(X),):
+            return F.T
+    except (TypeError, ValueError):
+        pass
+    return np.array([system(point) for point in X], dtype=float)
+
+
+def batch_jacobians(system, jacobian, X, F):
+    """ Матрицы Якоби в точках X (m×n×n): аналитические по точкам или разностные для всех точек сразу """
+    if jacobian is not None:
+        return np.array([jacobian(point) for point in X], dtype=float)
+
+    J = np.empty((len(X), F.shape[1], X.shape[1]))
+    for j in range(X.shape[1]):
+        h = sqrt(np.finfo(float).eps) * np.maximum(np.abs(X[:, j]), 1.0)
+        shifted = X.copy()
+        shifted[:, j] += h
+        J[:, :, j] = (batch_values(system, shifted) - F) / h[:, None]
+    return J
+
+
+def starting_points(left, right, dimension, count=MULTISTART_POINTS, seeds="halton"):
+    """ Начальные приближения в кубе [left, right]^n: равномерная сетка или квазислучайная последовательность Холтона """
+    if seeds == "grid":
+        side = max(2, int(round(count ** (1 / dimension))))
+        axes = np.meshgrid(*[np.linspace(left, right, side)] * dimension)
+        return np.stack([axis.ravel() for axis in axes], axis=1)
+    sample = qmc.Halton(d=dimension, scramble=False).random(count + 1)[1:]  # Первая точка Холтона - угол куба
+    return qmc.scale(sample, [left] * dimension, [right] * dimension)
+
+
+def multistart_newton(a, jacobian, left, right, dimension=2, epsilon=1e-6, max_iterations=100,
+                      count=MULTISTART_POINTS, seeds="halton", tolerance=None):
+    """
+    Многостартовый метод Ньютона: итерации идут одновременно из всех начальных приближений,
+    значения системы и матрицы Якоби вычисляются для всех еще не сошедшихся точек сразу,
+    линейные системы решаются пакетно (np.linalg.solve для стопки матриц).
+    Точки с вырожденной матрицей Якоби, ушедшие на бесконечность или не сошедшиеся за max_iterations отбрасываются,
+    сошедшиеся объединяются: решения ближе tolerance (по умолчанию 1000·epsilon) считаются одним.
+    Возвращает список решений (SystemRoot) и число отброшенных начальных приближений.
+    """
+    X = starting_points(left, right, dimension, count, seeds)
+    tolerance = tolerance if tolerance is not None else 1000 * epsilon
+    iterations = np.zeros(len(X), dtype=int)
+    converged = np.zeros(len(X), dtype=bool)
+    active = np.arange(len(X))
+
+    for _ in range(max_iterations):
+        if not active.size:
+            break
+        points = X[active]
+        F = batch_values(a, points)
+        J = batch_jacobians(a, jacobian, points, F)
+
+        # Вырожденные матрицы Якоби исключаются до решения, иначе упадет решение всей стопки
+        with np.errstate(all='ignore'):
+            regular = np.linalg.cond(J) < 1 / np.finfo(float).eps
+        delta = np.zeros_like(points)
+        delta[regular] = np.linalg.solve(J[regular], -F[regular][..., None])[..., 0]
+
+        X[active] = points + delta
+        iterations[active] += 1
+        steps = np.linalg.norm(delta, axis=1)
+        finished = regular & (steps < epsilon)
+        converged[active[finished]] = True
+        failed = ~regular | ~np.all(np.isfinite(X[active]), axis=1) | (np.abs(X[active]).max(axis=1) > DIVERGENCE_BOUND)
+        active = active[~(finished | failed)]
+
+    roots = []
+    residuals = np.linalg.norm(batch_values(a, X[converged]), axis=1) if converged.any() else []
+    for point, count_iterations, residual in zip(X[converged], iterations[converged], residuals):
+        for root in roots:
+            if np.linalg.norm(root.point - point) < tolerance:
+                root.starts += 1
+                root.iterations = min(root.iterations, int(count_iterations))
+                if residual < root.residual:
+                    root.point, root.residual = point, float(residual)
+                break
+        else:
+            roots.append(SystemRoot(point, 1, int(count_iterations), float(residual)))
+
+    roots.sort(key=lambda root: tuple(root.point))
+    return roots, int(len(X) - converged.sum())
+
+
+def choose_mode():
+    mode = input(f"Выберите режим метода ({'/'.join(MODES)}, по умолчанию {MODES[0]}): ").strip().lower() or MODES[0]
+    if mode not in MODES:
+        print("(!) Такого режима нет.")
+        return choose_mode()
+    return mode
+
+
 def run():
     plot_system(a)
 
+    if input("Найти все решения в квадрате [-2, 2]^2 (многостартовый метод Ньютона)? [y/n] ") == "y":
+        epsilon = float(input('Введите погрешность вычисления: '))
+        roots, dropped = multistart_newton(a, jacobian, -2, 2, epsilon=epsilon)
+        print(f"Найдено решений: {len(roots)} (отброшено начальных приближений: {dropped})")
+        for number, root in enumerate(roots, start=1):
+            print(f"{number}. x = {root.point[0]:.6f}, y = {root.point[1]:.6f}, невязка: {root.residual:.2e}, "
+                  f"сошлось приближений: {root.starts}, итераций: {root.iterations}")
+        return
+
     x0, y0 = map(float, input("Введите начальные приближения x0, y0: ").split())
     epsilon = float(input('Введите погрешность вычисления: '))
+    mode = choose_mode()
 
-    xy_solution, iterations = newton_method(a, jacobian, (x0, y0), epsilon)
+    xy_solution, iterations, stats = newton_method(a, jacobian, (x0, y0), epsilon, mode=mode)
 
     if xy_solution is not None:
         print(f"\nРешение: x = {xy_solution[0]:.6f}, y = {xy_solution[1]:.6f}")
         print(f"Количество итераций: {iterations}")
         print(f'Невязка: {a(xy_solution)[0]:.2e}, {a(xy_solution)[1]:.2e}')
+    print(stats)
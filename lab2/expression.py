@@ -0,0 +1,234 @@
+import ast
+from typing import Callable, Dict
+
+import numpy as np
+
+
+# Функции, которые можно использовать в выражении, и их реализации (работают и с числами, и с массивами)
+FUNCTIONS: Dict[str, Callable] = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'asin': np.arcsin, 'arccos': np.arccos, 'acos': np.arccos,
+    'arctan': np.arctan, 'atan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'ln': np.log, 'log10': np.log10,
+    'sqrt': np.sqrt, 'cbrt': np.cbrt, 'abs': np.abs,
+}
+CONSTANTS = {'e': np.e, 'pi': np.pi}
+VARIABLE = 'x'
+
+BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class Expression:
+    """
+    Выражение от x, заданное текстом (например, '-x/2 + e^x + 5*sin(x)').
+    Текст разбирается модулем ast, допускаются только числа, x, константы e и pi,
+    операции + - * / ^ (или **) и функции из FUNCTIONS - никакой другой код выполнить нельзя.
+    Выражение компилируется в функцию на NumPy, которая принимает и числа, и массивы,
+    а также дуальные числа (автоматическое дифференцирование, см. dual.py).
+    """
+
+    def __init__(self, text: str):
+        try:
+            tree = ast.parse(text.replace('^', '**').strip(), mode='eval')
+        except SyntaxError:
+            raise ValueError(f'Не удалось разобрать выражение "{text}"')
+        validate(tree.body)
+        self.tree = tree.body
+        self.text = text
+        self.function = compile_tree(self.tree)
+
+    @classmethod
+    def from_tree(cls, tree: ast.AST) -> 'Expression':
+        expression = cls.__new__(cls)
+        expression.tree = tree
+        expression.text = ast.unparse(tree).replace('**', '^')
+        expression.function = compile_tree(tree)
+        return expression
+
+    def __call__(self, x):
+        return self.function(x)
+
+    def derivative(self) -> 'Expression':
+        """
+        Символьная производная по x (с упрощением умножения на 0 и 1).
+        """
+        return Expression.from_tree(differentiate(self.tree))
+
+    def __str__(self):
+        return self.text
+
+
+def validate(node: ast.AST):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return
+    if isinstance(node, ast.Name) and (node.id == VARIABLE or node.id in CONSTANTS):
+        return
+    if isinstance(node, ast.BinOp) and isinstance(node.op, BINARY_OPERATORS):
+        validate(node.left)
+        validate(node.right)
+        return
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, UNARY_OPERATORS):
+        validate(node.operand)
+        return
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+            and len(node.args) == 1 and not node.keywords:
+        validate(node.args[0])
+        return
+
+    if isinstance(node, ast.Name):
+        raise ValueError(f'Неизвестное имя "{node.id}" (переменная - {VARIABLE}, константы - e, pi)')
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+        raise ValueError(f'Функция "{node.func.id}" принимает ровно один аргумент')
+    if isinstance(node, ast.Call):
+        raise ValueError(f'Неизвестная функция "{ast.unparse(node.func)}", доступны: {", ".join(FUNCTIONS)}')
+    raise ValueError(f'Недопустимая конструкция "{ast.unparse(node)}"')
+
+
+def compile_tree(tree: ast.AST) -> Callable:
+    code = compile(ast.fix_missing_locations(ast.Expression(
+        ast.Lambda(args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=VARIABLE)], kwonlyargs=[],
+                                      kw_defaults=[], defaults=[]), body=tree))), '<выражение>', 'eval')
+    return eval(code, {'__builtins__': {}, **FUNCTIONS, **CONSTANTS})
+
+
+def constant(value: float) -> ast.AST:
+    return ast.Constant(value) if value >= 0 else ast.UnaryOp(ast.USub(), ast.Constant(-value))
+
+
+def value_of(node: ast.AST):
+    """
+    Числовое значение узла, составленного только из чисел и арифметических операций (None для остальных узлов).
+    """
+    if not all(isinstance(child, (ast.Constant, ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop))
+               for child in ast.walk(node)):
+        return None
+    try:
+        return compile_tree(node)(0)
+    except (ZeroDivisionError, OverflowError):
+        return None
+
+
+def depends_on_x(node: ast.AST) -> bool:
+    return any(isinstance(child, ast.Name) and child.id == VARIABLE for child in ast.walk(node))
+
+
+def add(left: ast.AST, right: ast.AST) -> ast.AST:
+    if value_of(left) == 0:
+        return right
+    if value_of(right) == 0:
+        return left
+    return ast.BinOp(left, ast.Add(), right)
+
+
+def subtract(left: ast.AST, right: ast.AST) -> ast.AST:
+    if value_of(right) == 0:
+        return left
+    if value_of(left) == 0:
+        return negate(right)
+    return ast.BinOp(left, ast.Sub(), right)
+
+
+def multiply(left: ast.AST, right: ast.AST) -> ast.AST:
+    if value_of(left) == 0 or value_of(right) == 0:
+        return constant(0)
+    if value_of(left) == 1:
+        return right
+    if value_of(right) == 1:
+        return left
+    return ast.BinOp(left, ast.Mult(), right)
+
+
+def divide(left: ast.AST, right: ast.AST) -> ast.AST:
+    if value_of(left) == 0:
+        return constant(0)
+    if value_of(right) == 1:
+        return left
+    return ast.BinOp(left, ast.Div(), right)
+
+
+def power(base: ast.AST, exponent: ast.AST) -> ast.AST:
+    if value_of(exponent) == 1:
+        return base
+    if value_of(exponent) == 0:
+        return constant(1)
+    return ast.BinOp(base, ast.Pow(), exponent)
+
+
+def negate(node: ast.AST) -> ast.AST:
+    value = value_of(node)
+    if value is not None:
+        return constant(-value)
+    return ast.UnaryOp(ast.USub(), node)
+
+
+def call(name: str, argument: ast.AST) -> ast.AST:
+    return ast.Call(ast.Name(name, ast.Load()), [argument], [])
+
+
+# Производные функций одного аргумента: f'(u) как выражение от u
+FUNCTION_DERIVATIVES: Dict[str, Callable[[ast.AST], ast.AST]] = {
+    'sin': lambda u: call('cos', u),
+    'cos': lambda u: negate(call('sin', u)),
+    'tan': lambda u: divide(constant(1), power(call('cos', u), constant(2))),
+    'arcsin': lambda u: divide(constant(1), call('sqrt', subtract(constant(1), power(u, constant(2))))),
+    'arccos': lambda u: negate(divide(constant(1), call('sqrt', subtract(constant(1), power(u, constant(2)))))),
+    'arctan': lambda u: divide(constant(1), add(constant(1), power(u, constant(2)))),
+    'sinh': lambda u: call('cosh', u),
+    'cosh': lambda u: call('sinh', u),
+    'tanh': lambda u: divide(constant(1), power(call('cosh', u), constant(2))),
+    'exp': lambda u: call('exp', u),
+    'log': lambda u: divide(constant(1), u),
+    'log10': lambda u: divide(constant(1), multiply(u, call('log', constant(10)))),
+    'sqrt': lambda u: divide(constant(1), multiply(constant(2), call('sqrt', u))),
+    'cbrt': lambda u: divide(constant(1), multiply(constant(3), power(call('cbrt', u), constant(2)))),
+    'abs': lambda u: divide(u, call('abs', u)),
+}
+ALIASES = {'asin': 'arcsin', 'acos': 'arccos', 'atan': 'arctan', 'ln': 'log'}
+
+
+def differentiate(node: ast.AST) -> ast.AST:
+    """
+    Производная выражения по x по правилам дифференцирования.
+    """
+    if not depends_on_x(node):
+        return constant(0)
+    if isinstance(node, ast.Name):
+        return constant(1)
+
+    if isinstance(node, ast.UnaryOp):
+        derivative = differentiate(node.operand)
+        return negate(derivative) if isinstance(node.op, ast.USub) else derivative
+
+    if isinstance(node, ast.Call):
+        argument = node.args[0]
+        name = ALIASES.get(node.func.id, node.func.id)
+        return multiply(FUNCTION_DERIVATIVES[name](argument), differentiate(argument))
+
+    u, v = node.left, node.right
+    du, dv = differentiate(u), differentiate(v)
+    if isinstance(node.op, ast.Add):
+        return add(du, dv)
+    if isinstance(node.op, ast.Sub):
+        return subtract(du, dv)
+    if isinstance(node.op, ast.Mult):
+        return add(multiply(du, v), multiply(u, dv))
+    if isinstance(node.op, ast.Div):
+        if not depends_on_x(v):
+            return divide(du, v)
+        return divide(subtract(multiply(du, v), multiply(u, dv)), power(v, constant(2)))
+
+    # Степень
+    if not depends_on_x(v):
+        # (u^c)' = c·u^(c-1)·u'
+        exponent = value_of(v)
+        reduced = constant(exponent - 1) if exponent is not None else subtract(v, constant(1))
+        return multiply(multiply(v, power(u, reduced)), du)
+    if not depends_on_x(u):
+        # (c^v)' = c^v·ln(c)·v'
+        if isinstance(u, ast.Name) and u.id == 'e':
+            return multiply(node, dv)
+        return multiply(multiply(node, call('log', u)), dv)
+    # (u^v)' = u^v·(v'·ln(u) + v·u'/u)
+    return multiply(node, add(multiply(dv, call('log', u)), divide(multiply(v, du), u)))
@@ -31,7 +31,7 @@ def choose_equation_type():
 
 def choose_equation(functions) -> Equation:
     """
-    Запрашивает у пользователя выбор уравнения из предложенного списка.
+    Запрашивает у пользователя выбор уравнения из предложенного списка или ввод своего уравнения.
 
     Аргументы:
         functions (dict): Словарь с номерами и уравнениями.
@@ -42,6 +42,7 @@ def choose_equation(functions) -> Equation:
     print("Выберите уравнение:")
     for num, func in functions.items():
         print(str(num) + ': ' + func.text)
+    print(str(len(functions) + 1) + ': Ввести свое уравнение')
 
     try:
         equation_number = int(input("Введите номер уравнения: "))
@@ -49,13 +50,34 @@ def choose_equation(functions) -> Equation:
         print('(!) Вы ввели не число')
         return choose_equation(functions)
 
-    if equation_number < 1 or equation_number > len(functions):
+    if equation_number < 1 or equation_number > len(functions) + 1:
         print("(!) Такого номера нет.")
         return choose_equation(functions)
 
+    if equation_number == len(functions) + 1:
+        return read_equation()
+
     return functions[equation_number]
 
 
+def read_equation() -> Equation:
+    """
+    Запрашивает у пользователя запись функции f(x) уравнения f(x) = 0.
+
+    Возвращает:
+        Equation: Уравнение, функция которого скомпилирована из введенной записи.
+    """
+    text = input("Введите f(x) (операции + - * / ^, функции sin, cos, exp, log, sqrt и др., константы e, pi): ")
+    try:
+        equation = Equation.from_text(text)
+    except ValueError as e:
+        print(f'(!) {e}')
+        return read_equation()
+
+    print(f"f'(x) = {equation.function.derivative()}")
+    return equation
+
+
 def choose_method_number(methods) -> int:
     """
     Запрашивает у пользователя выбор метода решения.
@@ -1,31 +1,8 @@
-import math
-
-from dto.equation import Equation  # Импорт класса уравнения
-from methods.half_division import HalfDivisionMethod  # Метод половинного деления
-from methods.newton import NewtonMethod  # Метод Ньютона
-from methods.simple_iterations import SimpleIterationsMethod  # Метод простых итераций
-from methods.chord import ChordMethod  # Метод хорд
+from catalog import methods, predefined_functions  # Методы решения и предопределенные уравнения
 
 import equations_system  # Модуль для работы с системами уравнений
 import input_handler  # Модуль для обработки ввода пользователя
-
-# Словарь доступных методов решения
-methods = {
-    1: HalfDivisionMethod,
-    2: ChordMethod,
-    3: SimpleIterationsMethod,
-    4: NewtonMethod
-}
-
-# Предопределенные функции, представленные в виде лямбда-выражений
-predefined_functions = {
-    1: Equation(lambda x: (-1.38*x**3 - 5.42*x**2 + 2.57*x + 10.95), '-1.38*x^3 - 5.42*x^2 + 2.57*x + 10.95'),
-    2: Equation(lambda x: (x**3 - 1.89*x**2 - 2*x + 1.76), 'x^3 - 1.89*x^2 - 2*x + 1.76'),
-    # Источник функции: https://cutt.ly/6zNbCha
-    3: Equation(lambda x: (x / 2 - 2 * (x + 2.39) ** (1 / 3)), 'x/2 - 2*(x + 2.39)^(1/3)'),
-    # Источник функции: https://cutt.ly/MzNdHH5
-    4: Equation(lambda x: (-x / 2 + math.e ** x + 5 * math.sin(x)), '-x/2 + e^x + 5*sin(x)'),
-}
+import root_scanner  # Поиск всех корней на отрезке
 
 ENABLE_LOGGING = True  # Флаг для включения логирования
 
@@ -47,6 +24,20 @@ while True:
         # Выбор метода решения
         method_number = input_handler.choose_method_number(methods)
 
+        if input('Найти все корни на отрезке (отделение корней по сетке)? [y/n] ') == 'y':
+            left, right, epsilon, decimal_places = input_handler.read_initial_data()
+            try:
+                roots = root_scanner.scan_roots(function, left, right, methods[method_number],
+                                                epsilon, decimal_places)
+            except Exception as e:
+                print('(!) Что-то пошло не так при поиске корней: ', e)
+                continue
+            root_scanner.print_roots(roots)
+
+            if input('\nЕще раз? [y/n] ') != 'y':
+                break
+            continue
+
         while True:
             if method_number == 4:  # Метод Ньютона требует начального приближения
                 left, epsilon, decimal_places = input_handler.read_initial_data_newton()
@@ -74,13 +65,17 @@ while True:
         output_file_name = input("Введите имя файла для вывода результата или пустую строку, чтобы вывести в консоль: ")
 
         try:
-            if ENABLE_LOGGING:
-                print('Процесс решения: ')
             result = method.solve()  # Запуск метода решения
         except Exception as e:
             print(e)
             print('(!) Что-то пошло не так при решении: ', e)
             continue
+        finally:
+            method.trace.close()
+
+        if ENABLE_LOGGING:
+            print('Процесс решения: ')
+            print(method.trace.render())  # Трасса выводится текстом только после решения
 
         input_handler.print_result(result, output_file_name)  # Вывод результата
 
@@ -1,23 +1,51 @@
-from typing import Tuple
+from typing import List, Tuple
 
+from dto.counted_function import CountedFunction
 from dto.equation import Equation
 from dto.result import Result
+from tracing import MemoryTrace, NullTrace
 
 
 class Method:
     name = None
+    trace_fields = ()  # Поля записи трассы на каждой итерации
 
     def __init__(self, equation: Equation, left: float, right: float,
-                 epsilon: float, decimal_places: int, log: bool):
+                 epsilon: float, decimal_places: int, log: bool, trace: NullTrace = None):
         self.log = log
+        # Процесс решения записывается в трассу и выводится текстом только после решения
+        self.trace = trace if trace is not None else (MemoryTrace() if log else NullTrace())
         self.decimal_places = decimal_places
         self.epsilon = epsilon
         self.right = right
         self.left = left
         self.equation = equation
+        self.f = CountedFunction(equation.function)  # Все вычисления функции идут через счетчик
+        self.messages = []  # Сообщения о ходе решения (например, о сходимости)
+
+    def report(self, message: str):
+        """
+        Сообщение о ходе решения: сохраняется в messages и выводится, только если включен вывод процесса решения.
+        """
+        self.messages.append(message)
+        if self.log:
+            print(message)
+
+    def result(self, root: float, iterations: int, converged: bool = True) -> Result:
+        return Result(root, self.f(root), iterations, self.decimal_places, self.f.evaluations, converged)
 
     def solve(self) -> Result:
         pass
 
     def check(self) -> Tuple[bool, str]:
         return True, ''
+
+    @classmethod
+    def solve_brackets(cls, equation: Equation, lefts, rights,
+                       epsilon: float, decimal_places: int) -> List[Result]:
+        """
+        Уточнение корней на нескольких отрезках, каждый из которых содержит ровно один корень.
+        По умолчанию метод запускается на каждом отрезке отдельно, без вывода процесса решения и сообщений.
+        """
+        return [cls(equation, left, right, epsilon, decimal_places, False).solve()
+                for left, right in zip(lefts, rights)]
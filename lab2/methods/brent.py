@@ -0,0 +1,88 @@
+import sys
+
+from dto.result import Result
+from methods.base import Method
+
+
+MAX_ITERATIONS = 10_000
+BISECTION, SECANT, INTERPOLATION = 0, 1, 2  # Виды шага (для трассы)
+
+
+class BrentMethod(Method):
+    name = 'Метод Брента'
+    trace_fields = ('шаг (0 - деление, 1 - секущая, 2 - интерполяция)', 'b', 'c', 'f(b)', '|b - c|')
+
+    def check(self):
+        root_exists = self.equation.root_exists(self.left, self.right, self.f)
+        return root_exists, 'Отсутствует корень на заданном промежутке или корней > 2' if not root_exists else ''
+
+    def solve(self) -> Result:
+        """
+        Метод Брента: обратная квадратичная интерполяция или секущая, когда они дают точку
+        внутри отрезка и достаточно сокращают его, иначе - шаг половинного деления.
+        Корень все время остается между b и c, поэтому сходимость гарантирована,
+        а вблизи корня скорость сходимости сверхлинейная.
+        """
+        f = self.f
+        epsilon = self.epsilon
+
+        a, b = self.left, self.right
+        fa, fb = f(a), f(b)
+        c, fc = a, fa
+        d = e = b - a  # Текущий и предыдущий шаги
+        trace = self.trace
+        trace.start(self.trace_fields)
+
+        iteration = 0
+        while iteration < MAX_ITERATIONS:
+            iteration += 1
+
+            # b - лучшее приближение, корень между b и c
+            if fb * fc > 0:
+                c, fc = a, fa
+                d = e = b - a
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+
+            tolerance = 2 * sys.float_info.epsilon * abs(b) + epsilon / 2
+            middle = (c - b) / 2
+            if abs(middle) <= tolerance and abs(fb) <= epsilon or fb == 0:
+                break
+
+            kind = BISECTION
+            if abs(e) >= tolerance and abs(fa) > abs(fb):
+                s = fb / fa
+                if a == c:
+                    # Секущая
+                    p = 2 * middle * s
+                    q = 1 - s
+                    kind = SECANT
+                else:
+                    # Обратная квадратичная интерполяция
+                    q = fa / fc
+                    r = fb / fc
+                    p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+                    q = (q - 1) * (r - 1) * (s - 1)
+                    kind = INTERPOLATION
+                if p > 0:
+                    q = -q
+                p = abs(p)
+
+                if 2 * p < min(3 * middle * q - abs(tolerance * q), abs(e * q)):
+                    e, d = d, p / q
+                else:
+                    d = e = middle
+                    kind = BISECTION
+            else:
+                d = e = middle
+
+            a, fa = b, fb
+            b += d if abs(d) > tolerance else (tolerance if middle > 0 else -tolerance)
+            fb = f(b)
+
+            if trace.enabled:
+                trace.record(iteration, kind, b, c, fb, abs(b - c))
+
+        trace.close()
+        return self.result(b, iteration)
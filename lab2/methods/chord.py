@@ -5,16 +5,19 @@ from methods.base import Method
 
 class ChordMethod(Method):
     name = 'Метод хорд'
+    trace_fields = ('a', 'b', 'x', 'f(a)', 'f(b)', 'f(x)', '|x_k+1 - x_k|')
 
     def check(self):
-        root_exists = self.equation.root_exists(self.left, self.right)
+        root_exists = self.equation.root_exists(self.left, self.right, self.f)
         return root_exists, 'Отсутствует корень на заданном промежутке или корней > 2' if not root_exists else ''
 
     def solve(self) -> Result:
-        f = self.equation.function
+        f = self.f
         a = self.left
         b = self.right
         epsilon = self.epsilon
+        trace = self.trace
+        trace.start(self.trace_fields)
         iteration = 0
 
         x = a - (b - a) * f(a) / (f(b) - f(a))
@@ -31,13 +34,13 @@ class ChordMethod(Method):
                 a = x
 
             x = a - (b - a) * f(a) / (f(b) - f(a))
-            if self.log:
-                print(f'{iteration}: a = {a:.3f}, b = {b:.3f}, x = {x:.3f}, '
-                      f'f(a) = {f(a):.3f}, f(b) = {f(b):.3f}, f(x)={f(x)}, |x_k+1 - x_k| = {abs(x - last_x)}')
+            if trace.enabled:
+                trace.record(iteration, a, b, x, f(a), f(b), f(x), abs(x - last_x))
 
             if np.abs(f(x)) <= epsilon and abs(x - last_x) <= epsilon:
                 break
 
             last_x = x
 
-        return Result(x, f(x), iteration, self.decimal_places)
+        trace.close()
+        return self.result(x, iteration)
@@ -1,19 +1,30 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from dto.equation import Equation
 from dto.result import Result
 from methods.base import Method
 
 
+MAX_BATCH_ITERATIONS = 2_000  # Предельное число шагов пакетного деления (за ~1100 шагов отрезок вырождается в точку)
+
+
 class HalfDivisionMethod(Method):
     name = 'Метод половинного деления'
+    trace_fields = ('a', 'b', 'x', 'f(a)', 'f(b)', 'f(x)', '|a-b|')
 
     def check(self):
-        root_exists = self.equation.root_exists(self.left, self.right)
+        root_exists = self.equation.root_exists(self.left, self.right, self.f)
         return root_exists, 'Отсутствует корень на заданном промежутке или корней > 2' if not root_exists else ''
 
     def solve(self) -> Result:
-        f = self.equation.function
+        f = self.f
         a = self.left
         b = self.right
         epsilon = self.epsilon
+        trace = self.trace
+        trace.start(self.trace_fields)
 
         iteration = 0
         while True:
@@ -22,11 +33,10 @@ class HalfDivisionMethod(Method):
             fb = f(b)
             x = (a + b) / 2
             fx = f(x)
-            if self.log:
-                print(f'{iteration}: a = {a:f}, b = {b:.3f}, x = {x:.3f}, '
-                      f'f(a) = {fa:.3f}, f(b) = {fb:.3f}, f(x)={fx}, |a-b| = {abs(a - b)}')
+            if trace.enabled:
+                trace.record(iteration, a, b, x, fa, fb, fx, abs(a - b))
 
-            if abs(a - b) <= epsilon and abs(fx) <= epsilon:
+            if abs(a - b) <= epsilon and abs(fx) <= epsilon or fx == 0:
                 break
 
             if fa * fx < 0:
@@ -34,4 +44,67 @@ class HalfDivisionMethod(Method):
             else:
                 a = x
 
-        return Result(x, fx, iteration, self.decimal_places)
+        trace.close()
+        return self.result(x, iteration)
+
+    @staticmethod
+    def solve_batch(equation: Equation, left, right, epsilon: float,
+                    parameters=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Половинное деление сразу для массива отрезков [left[i], right[i]].
+        На каждом шаге функция вычисляется один раз - в серединах всех еще не сошедшихся отрезков;
+        значения на концах не пересчитываются. Каждый отрезок останавливается по тому же критерию,
+        что и solve: |a - b| <= epsilon и |f(x)| <= epsilon, либо f(x) = 0 (или когда отрезок перестал делиться).
+        :param equation: Уравнение (лучше, если его функция принимает массивы NumPy).
+        :param left: Левые концы отрезков.
+        :param right: Правые концы отрезков.
+        :param epsilon: Точность.
+        :param parameters: Параметры уравнения для каждого отрезка (массив длины числа отрезков
+                           или кортеж таких массивов); функция тогда вызывается как f(x, *parameters).
+        :return: Массивы корней, значений функции в них и чисел итераций для каждого отрезка.
+        """
+        a = np.array(left, dtype=float, ndmin=1)
+        b = np.array(right, dtype=float, ndmin=1)
+        if parameters is None:
+            parameters = ()
+        elif not isinstance(parameters, tuple):
+            parameters = (parameters,)
+        parameters = tuple(np.broadcast_to(np.asarray(p, dtype=float), a.shape) for p in parameters)
+        fa = equation.values(a, *parameters)
+
+        x = (a + b) / 2
+        fx = np.zeros_like(x)
+        iterations = np.zeros(x.shape, dtype=int)
+        active = np.arange(x.size)  # Номера еще не сошедшихся отрезков
+
+        while active.size and iterations.max(initial=0) < MAX_BATCH_ITERATIONS:
+            a_active, b_active, fa_active = a[active], b[active], fa[active]
+            x_active = (a_active + b_active) / 2
+            fx_active = equation.values(x_active, *(p[active] for p in parameters))
+            x[active], fx[active] = x_active, fx_active
+            iterations[active] += 1
+
+            # Точный ноль в середине - корень найден (иначе отрезок сдвинулся бы от него)
+            done = (np.abs(a_active - b_active) <= epsilon) & (np.abs(fx_active) <= epsilon) \
+                | (fx_active == 0) | (x_active == a_active) | (x_active == b_active)
+
+            # Сошедшиеся отрезки больше не изменяются: x и f(x) в них - найденный корень
+            going = ~done
+            active, a_active, b_active, fa_active, x_active, fx_active = \
+                active[going], a_active[going], b_active[going], fa_active[going], x_active[going], fx_active[going]
+
+            # Корень в левой половине - сдвигаем правый конец, иначе левый
+            to_left = fa_active * fx_active < 0
+            b[active] = np.where(to_left, x_active, b_active)
+            a[active] = np.where(to_left, a_active, x_active)
+            fa[active] = np.where(to_left, fa_active, fx_active)
+
+        return x, fx, iterations
+
+    @classmethod
+    def solve_brackets(cls, equation: Equation, lefts, rights,
+                       epsilon: float, decimal_places: int) -> List[Result]:
+        roots, values, iterations = cls.solve_batch(equation, lefts, rights, epsilon)
+        # Кроме шагов деления, функция один раз вычисляется на левых концах отрезков
+        return [Result(float(root), float(value), int(count), decimal_places, int(count) + 1)
+                for root, value, count in zip(roots, values, iterations)]
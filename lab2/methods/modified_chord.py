@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+
+from dto.result import Result
+from methods.base import Method
+
+
+MAX_ITERATIONS = 10_000
+
+
+class ModifiedChordMethod(Method, ABC):
+    """
+    Модифицированный метод хорд (ложного положения). Если новое приближение дважды подряд
+    оказывается с одной стороны от корня, значение функции на неподвижном конце уменьшается
+    (см. scale), и хорда перестает упираться в этот конец, как в обычном методе хорд.
+    """
+
+    trace_fields = ('a', 'b', 'x', 'f(a)', 'f(x)', '|x_k+1 - x_k|')
+
+    def check(self):
+        root_exists = self.equation.root_exists(self.left, self.right, self.f)
+        return root_exists, 'Отсутствует корень на заданном промежутке или корней > 2' if not root_exists else ''
+
+    @abstractmethod
+    def scale(self, fb: float, fx: float) -> float:
+        """
+        Множитель для значения функции на неподвижном конце.
+        :param fb: Значение функции в предыдущем приближении.
+        :param fx: Значение функции в новом приближении.
+        """
+
+    def solve(self) -> Result:
+        f = self.f
+        epsilon = self.epsilon
+
+        a, b = self.left, self.right
+        fa, fb = f(a), f(b)
+        last_x = a
+        trace = self.trace
+        trace.start(self.trace_fields)
+
+        iteration = 0
+        while iteration < MAX_ITERATIONS:
+            iteration += 1
+
+            x = b - fb * (b - a) / (fb - fa)
+            fx = f(x)
+
+            if fx * fb < 0:
+                # Корень между x и b: b становится неподвижным концом
+                a, fa = b, fb
+            else:
+                # Корень все еще между a и x: неподвижный конец тот же, его значение уменьшается
+                fa *= self.scale(fb, fx)
+            b, fb = x, fx
+
+            if trace.enabled:
+                trace.record(iteration, a, b, x, fa, fx, abs(x - last_x))
+
+            if abs(fx) <= epsilon and abs(x - last_x) <= epsilon or fx == 0:
+                break
+
+            last_x = x
+
+        trace.close()
+        return self.result(x, iteration)
+
+
+class IllinoisMethod(ModifiedChordMethod):
+    name = 'Метод хорд (Illinois)'
+
+    def scale(self, fb: float, fx: float) -> float:
+        return 0.5
+
+
+class AndersonBjorckMethod(ModifiedChordMethod):
+    name = 'Метод хорд (Андерсон-Бьорк)'
+
+    def scale(self, fb: float, fx: float) -> float:
+        m = 1 - fx / fb
+        return m if m > 0 else 0.5
@@ -1,34 +1,35 @@
-import numpy as np
-from scipy.misc import derivative
-
 from dto.result import Result
 from methods.base import Method
 
 
-dx = 0.00001
-
 class NewtonMethod(Method):
     name = 'Метод Ньютона'
+    trace_fields = ('x_k', 'f(x_k)', "f'(x_k)", 'x_k+1', '|x_k+1 - x_k|')
 
     def solve(self) -> Result:
-        f = self.equation.function
+        f = self.f
         x0 = self.left
 
         epsilon = self.epsilon
+        trace = self.trace
+        trace.start(self.trace_fields)
         iteration = 0
 
+        # Значение и производная получаются одним вычислением функции (автоматическое дифференцирование);
+        # в точке x_k+1 они считаются для проверки остановки и переиспользуются на следующей итерации
+        fx0, df = f.with_derivative(x0)
         while True:
             iteration += 1
 
-            df = derivative(f, x0, dx=dx)
-            x1 = x0 - f(x0) / df
-            if self.log:
-                print(f'{iteration}: x_k = {x0:.3f}, f(x_k) = {f(x0):.3f}, '
-                f'f\'(x_k) = {df:.3f}, x_k+1 = {x1:.3f}, |x_k+1 - x_k| = {abs(x1 - x0)}')
+            x1 = x0 - fx0 / df
+            fx1, df1 = f.with_derivative(x1)
+            if trace.enabled:
+                trace.record(iteration, x0, fx0, df, x1, abs(x1 - x0))
 
-            if abs(x1 - x0) < epsilon and f(x1) < epsilon:
+            if abs(x1 - x0) < epsilon and fx1 < epsilon:
                 break
 
-            x0 = x1
+            x0, fx0, df = x1, fx1, df1
 
-        return Result(x1, f(x1), iteration, self.decimal_places)
+        trace.close()
+        return self.result(x1, iteration)
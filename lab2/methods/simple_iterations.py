@@ -1,64 +1,100 @@
+import time
+
 import numpy
-from scipy.misc import derivative
 
 from dto.equation import Equation
 from dto.result import Result
 from methods.base import Method
+from tracing import NullTrace
 
 
-dx = 0.00001
-steps = 100
-MAX_ITERS = 50_000
+steps = 100  # Число точек сетки, на которой оцениваются f'(x) и проверяется условие сходимости
+MAX_ITERS = 50_000  # Предельное число итераций по умолчанию
+TIME_LIMIT = 10.0  # Предельное время итераций по умолчанию, с
 
 class SimpleIterationsMethod(Method):
     name = 'Метод простой итерации'
+    trace_fields = ('x_k', 'f(x_k)', 'x_k+1 = phi(x_k)', '|x_k - x_k+1|')
 
     def __init__(self, equation: Equation, left: float, right: float,
-                 epsilon: float, decimal_places: int, log: bool):
-        super().__init__(equation, left, right, epsilon, decimal_places, log)
-        f = self.equation.function
+                 epsilon: float, decimal_places: int, log: bool, trace: NullTrace = None,
+                 max_iterations: int = MAX_ITERS, time_limit: float = TIME_LIMIT):
+        super().__init__(equation, left, right, epsilon, decimal_places, log, trace)
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
 
     def check(self):
-        if not self.equation.root_exists(self.left, self.right):
+        if not self.equation.root_exists(self.left, self.right, self.f):
             return False, 'Отсутствует корень на заданном промежутке или корней > 2'
 
         return True, ''
 
-    def solve(self) -> Result:
-        f = self.equation.function
-        x = 1
-
-        max_derivative = max(abs(derivative(f, self.left, dx)), abs(derivative(f, self.right, dx)))
-        lbd = 1 / max_derivative
+    def relaxation(self):
+        """
+        Параметр lambda для phi(x) = x + lambda * f(x) по границам производной на отрезке:
+        при m <= f'(x) <= M одного знака lambda = -2/(m + M) дает наименьшее q = max|phi'(x)| = |M - m|/|M + m|.
+        f'(x) вычисляется на сетке одним векторным вызовом, по тем же значениям проверяется |phi'(x)| < 1.
+        :return: lambda и q.
+        """
+        grid = numpy.linspace(self.left, self.right, steps)
+        with numpy.errstate(all='ignore'):
+            slopes = self.f.derivatives(grid)
+        finite = numpy.isfinite(slopes)
+        if not finite.all():
+            self.report('(!) Производная не определена в части точек отрезка, они не учитываются')
+            grid, slopes = grid[finite], slopes[finite]
+        if not slopes.size:
+            return 0.0, numpy.inf
+
+        m, M = slopes.min(), slopes.max()
+        if m * M <= 0:
+            # f' меняет знак или обращается в ноль: сжатия нет ни при каком lambda, берем lambda = -1/max|f'|
+            self.report('(!) Производная меняет знак на отрезке, метод может не сойтись')
+            M = slopes[numpy.argmax(numpy.abs(slopes))]
+            lbd = -1 / M if M != 0 else 0.0
+        else:
+            lbd = -2 / (m + M)
+
+        dphi = numpy.abs(1 + lbd * slopes)
+        q = dphi.max()
+        self.report(f'lambda = {lbd}')
+        self.report(f'phi\'(a) = {dphi[0]}')
+        self.report(f'phi\'(b) = {dphi[-1]}')
+        self.report(f'q = max|phi\'(x)| = {q}')
+        if q >= 1:
+            self.report(f'Не выполнено условие сходимости метода |phi\'(x)| < 1 на интервале при x = {grid[numpy.argmax(dphi)]}')
+        return lbd, q
 
-        if derivative(f, x, dx) > 0:
-            lbd = -lbd
-
-        phi = lambda x: x + 1/23.005 * f(x)
+    def solve(self) -> Result:
+        f = self.f
+        lbd, _ = self.relaxation()
+        phi = lambda x: x + lbd * f(x)
 
-        print('phi\'(a) = ', abs(derivative(phi, self.left, dx)))
-        print('phi\'(b) = ', abs(derivative(phi, self.right, dx)))
-        for x in numpy.linspace(self.left, self.right, steps, endpoint=True):
-            if abs(derivative(phi, x, dx)) >= 1:
-                print(f'Не выполнено условие сходимости метода |phi\'(x)| < 1 на интервале при x = {x}')
-                break
+        # Начальное приближение - середина отрезка, на котором отделен корень
+        x = (self.left + self.right) / 2
 
+        trace = self.trace
+        trace.start(self.trace_fields)
+        deadline = time.perf_counter() + self.time_limit
         iteration = 0
+        converged = True
         while True:
             iteration += 1
 
-            if iteration == MAX_ITERS:
-              if (input(f'Достигнуто {iteration} итераций и ответа вы не получите! Хотите продолжить? [y/n]\n') != 'y'):
-                break
-
             x_prev = x
             x = phi(x)
 
-            if self.log:
-                print(f'{iteration}: xk = {x_prev:.4f}, f(xk) = {f(x_prev)}, '
-                      f'xk+1 = 𝜑(𝑥𝑘) = {x:.4f}, |xk - xk+1| = {abs(x - x_prev):}')
+            if trace.enabled:
+                trace.record(iteration, x_prev, f(x_prev), x, abs(x - x_prev))
 
             if abs(x - x_prev) <= self.epsilon and abs(f(x)) <= self.epsilon:
                 break
 
-        return Result(x, f(x), iteration, self.decimal_places)
+            if iteration >= self.max_iterations or time.perf_counter() > deadline:
+                converged = False  # Остановлен по числу итераций или времени, а не по точности
+                self.report(f'(!) Точность не достигнута: выполнено {iteration} итераций '
+                            f'(ограничения: {self.max_iterations} итераций, {self.time_limit} с)')
+                break
+
+        trace.close()
+        return self.result(x, iteration, converged)
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import List, Type
+
+import numpy as np
+
+from dto.equation import Equation
+from dto.result import Result
+from dual import value_and_derivative
+from methods.base import Method
+from methods.half_division import HalfDivisionMethod
+
+
+GRID_POINTS = 10_001  # Число точек сетки, на которой ищутся смены знака
+
+
+@dataclass
+class FoundRoot:
+    kind: str  # 'смена знака' или 'касание'
+    bracket: tuple  # Отрезок, на котором корень был отделен
+    result: Result
+
+
+def grid_values(function, x: np.ndarray) -> np.ndarray:
+    """
+    Значения на сетке; точки, где функция не определена (nan, комплексные значения), дают nan.
+    """
+    with np.errstate(all='ignore'):
+        try:
+            return Equation(function, '').values(x)
+        except (TypeError, ValueError):
+            values = np.empty_like(x)
+            for i, point in enumerate(x):
+                try:
+                    values[i] = float(function(point))
+                except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+                    values[i] = np.nan
+            return values
+
+
+def scan_roots(equation: Equation, left: float, right: float, method_class: Type[Method],
+               epsilon: float, decimal_places: int, points: int = GRID_POINTS) -> List[FoundRoot]:
+    """
+    Поиск всех корней на отрезке [left, right].
+    1. Функция вычисляется на равномерной сетке одним векторным вызовом.
+    2. Отрезки сетки со сменой знака уточняются выбранным методом (все сразу, см. Method.solve_brackets).
+       Смена знака бывает и на разрыве (например, у tan(x) в pi/2): уточненная точка принимается за корень,
+       только если |f| в ней не больше epsilon или меньше, чем в обоих узлах сетки, - у полюса |f| растет.
+    3. Локальные минимумы |f| без смены знака - кандидаты в корни касания (четной кратности):
+       там ищется ноль производной, и корень принимается, если |f| в нем не больше epsilon.
+    Корни, которые сетка не различает (ближе шага сетки друг к другу), могут быть пропущены.
+    :return: Список найденных корней по возрастанию со статистикой по каждому.
+    """
+    x = np.linspace(left, right, points)
+    y = grid_values(equation.function, x)
+    finite = np.isfinite(y)
+    magnitude = np.abs(y)
+    found = []
+
+    # Точные нули в узлах сетки
+    for i in np.flatnonzero(y == 0):
+        found.append(FoundRoot('в узле сетки', (x[i], x[i]), Result(x[i], 0.0, 0, decimal_places, 0)))
+
+    # Смены знака между соседними узлами
+    changes = np.flatnonzero(finite[:-1] & finite[1:] & (y[:-1] * y[1:] < 0))
+    if changes.size:
+        results = method_class.solve_brackets(equation, x[changes], x[changes + 1], epsilon, decimal_places)
+        found += [FoundRoot('смена знака', (x[i], x[i + 1]), result) for i, result in zip(changes, results)
+                  if abs(result.function_value_at_root) <= epsilon
+                  or abs(result.function_value_at_root) < min(magnitude[i], magnitude[i + 1])]
+
+    found += scan_tangencies(equation, x, y, epsilon, decimal_places)
+    found.sort(key=lambda root: root.result.root)
+    return found
+
+
+def scan_tangencies(equation: Equation, x: np.ndarray, y: np.ndarray,
+                    epsilon: float, decimal_places: int) -> List[FoundRoot]:
+    """
+    Корни касания: в локальном минимуме |f| без смены знака производная меняет знак,
+    ее ноль ищется пакетным делением пополам, затем проверяется |f| <= epsilon.
+    """
+    magnitude = np.abs(y)
+    inner = np.arange(1, len(x) - 1)
+    candidates = inner[np.isfinite(y[inner - 1]) & np.isfinite(y[inner + 1]) & (y[inner] != 0)
+                       & (y[inner - 1] * y[inner] > 0) & (y[inner + 1] * y[inner] > 0)
+                       & (magnitude[inner] < magnitude[inner - 1]) & (magnitude[inner] <= magnitude[inner + 1])]
+    if not candidates.size:
+        return []
+
+    evaluate = value_and_derivative(equation.function)
+    derivative = Equation(lambda point: evaluate(point)[1], 'f\'(x)')
+    try:
+        with np.errstate(all='ignore'):
+            slopes_left = derivative.values(x[candidates - 1])
+            slopes_right = derivative.values(x[candidates + 1])
+    except TypeError:
+        return []  # Функцию нельзя продифференцировать автоматически
+
+    candidates = candidates[slopes_left * slopes_right < 0]
+    if not candidates.size:
+        return []
+
+    points, _, iterations = HalfDivisionMethod.solve_batch(derivative, x[candidates - 1], x[candidates + 1], epsilon)
+    found = []
+    for i, point, count in zip(candidates, points, iterations):
+        value = float(equation.function(point))
+        if abs(value) <= epsilon:
+            result = Result(float(point), value, int(count), decimal_places, int(count) + 2)
+            found.append(FoundRoot('касание', (x[i - 1], x[i + 1]), result))
+    return found
+
+
+def print_roots(roots: List[FoundRoot]):
+    if not roots:
+        print('Корней на заданном отрезке не найдено.')
+        return
+
+    print(f'Найдено корней: {len(roots)}')
+    print('№ | Корень | f(корень) | Итераций | Вычислений функции | Тип | Отрезок')
+    for number, root in enumerate(roots, start=1):
+        result = root.result
+        print(f'{number} | {round(result.root, result.decimal_places)} | {result.function_value_at_root:.3e} | '
+              f'{result.iterations} | {result.evaluations} | {root.kind} | '
+              f'[{root.bracket[0]:.6g}, {root.bracket[1]:.6g}]')
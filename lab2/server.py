@@ -0,0 +1,294 @@
+import argparse
+import contextlib
+import json
+import math
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import asdict
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from catalog import methods, predefined_functions
+from dto.equation import Equation
+
+
+HOST = '127.0.0.1'  # Сервер принимает запросы только с этой машины
+PORT = 8765
+TIMEOUT = 10.0  # Ограничение времени на один запрос по умолчанию, с
+TIMEOUT_MARGIN = 1.0  # Запас ожидания сверх ограничения, после которого сервер перестает ждать процесс
+DECIMAL_PLACES = 6
+CHUNK_SIZE = 64  # Наибольшее число запросов пакета, передаваемых процессу за раз
+EQUATION_CACHE_SIZE = 256  # Число разобранных текстов уравнений, хранящихся в каждом процессе
+
+# Коды ошибок JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SOLVE_ERROR = -32000
+TIMEOUT_ERROR = -32001
+
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+@lru_cache(maxsize=EQUATION_CACHE_SIZE)
+def compile_equation(text: str) -> Equation:
+    return Equation.from_text(text)
+
+
+def equation_of(params: dict) -> Equation:
+    if 'function_id' in params:
+        try:
+            return predefined_functions[int(params['function_id'])]
+        except (KeyError, TypeError, ValueError):
+            raise RequestError(INVALID_PARAMS, f'Нет уравнения с номером {params["function_id"]}, '
+                                               f'доступны: {", ".join(map(str, predefined_functions))}')
+    if 'equation' in params:
+        try:
+            return compile_equation(str(params['equation']))
+        except ValueError as e:
+            raise RequestError(INVALID_PARAMS, str(e))
+    raise RequestError(INVALID_PARAMS, 'Нужно указать уравнение: equation (текст) или function_id (номер)')
+
+
+def method_of(value):
+    """
+    Класс метода по номеру из меню программы или по имени класса (например, "BrentMethod").
+    """
+    for number, method_class in methods.items():
+        if value == number or value == method_class.__name__:
+            return method_class
+    raise RequestError(INVALID_PARAMS, f'Неизвестный метод {value!r}, доступны: '
+                                       f'{", ".join(f"{number} ({method_class.__name__})" for number, method_class in methods.items())}')
+
+
+def timeout_of(params: dict) -> float:
+    try:
+        timeout = float(params.get('timeout', TIMEOUT))
+    except (TypeError, ValueError):
+        raise RequestError(INVALID_PARAMS, 'timeout должен быть числом секунд')
+    if not timeout > 0:
+        raise RequestError(INVALID_PARAMS, 'timeout должен быть положительным')
+    return timeout
+
+
+def raise_timeout(signum, frame):
+    raise TimeoutError
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float):
+    """
+    Прерывание решения по истечении seconds секунд (таймер SIGALRM процесса-исполнителя).
+    Где таймера нет (Windows), ограничение соблюдается только ожиданием на стороне сервера.
+    """
+    if not hasattr(signal, 'setitimer'):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def number(value) -> float:
+    value = float(value)
+    return value if math.isfinite(value) else None  # В JSON нет nan и inf
+
+
+def solve(params: dict) -> dict:
+    """
+    Решение уравнения по параметрам запроса: equation или function_id, method, left, right, epsilon,
+    decimal_places, timeout. Для метода Ньютона left - начальное приближение, right не нужен.
+    :return: Поля Result, название метода и его сообщения о ходе решения.
+    """
+    if not isinstance(params, dict):
+        raise RequestError(INVALID_PARAMS, 'Параметры solve передаются объектом')
+    equation = equation_of(params)
+    method_class = method_of(params.get('method', 1))
+    timeout = timeout_of(params)
+    try:
+        left = float(params['left'])
+        right = float(params.get('right', 0))
+        epsilon = float(params['epsilon'])
+        decimal_places = int(params.get('decimal_places', DECIMAL_PLACES))
+    except KeyError as e:
+        raise RequestError(INVALID_PARAMS, f'Не указан параметр {e.args[0]}')
+    except (TypeError, ValueError):
+        raise RequestError(INVALID_PARAMS, 'left, right, epsilon и decimal_places должны быть числами')
+
+    try:
+        with time_limit(timeout):
+            method = method_class(equation, left, right, epsilon, decimal_places, False)
+            verified, reason = method.check()
+            if not verified:
+                raise RequestError(INVALID_PARAMS, f'Введенные исходные данные для метода некорректны: {reason}')
+            result = method.solve()
+    except TimeoutError:
+        raise RequestError(TIMEOUT_ERROR, f'Решение не уложилось в {timeout} с')
+    except RequestError:
+        raise
+    except Exception as e:
+        raise RequestError(SOLVE_ERROR, f'Что-то пошло не так при решении: {e}')
+
+    answer = asdict(result)
+    answer['root'] = number(answer['root'])
+    answer['function_value_at_root'] = number(answer['function_value_at_root'])
+    answer['iterations'] = int(answer['iterations'])
+    answer['evaluations'] = int(answer['evaluations'])
+    answer['method'] = method_class.name
+    answer['output'] = ''.join(message + '\n' for message in method.messages)
+    return answer
+
+
+def solve_chunk(chunk: list) -> list:
+    """
+    Решение части пакета в процессе-исполнителе: одна передача данных между процессами на несколько запросов.
+    Ошибка одного запроса не прерывает остальные.
+    :return: По элементу на запрос: (True, результат) или (False, код ошибки, сообщение).
+    """
+    outcomes = []
+    for params in chunk:
+        try:
+            outcomes.append((True, solve(params)))
+        except RequestError as e:
+            outcomes.append((False, e.code, e.message))
+    return outcomes
+
+
+def catalog() -> dict:
+    return {
+        'methods': {number: method_class.name for number, method_class in methods.items()},
+        'functions': {number: equation.text for number, equation in predefined_functions.items()},
+    }
+
+
+class SolveServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pool: ProcessPoolExecutor, workers: int):
+        super().__init__(address, SolveRequestHandler)
+        self.pool = pool
+        self.workers = workers
+
+    def dispatch(self, calls: list) -> list:
+        """
+        Выполнение вызовов JSON-RPC (одиночного или пакета).
+        Вызовы solve делятся на части, которые решаются в пуле процессов параллельно.
+        :return: Ответы в порядке вызовов; для уведомлений (вызовов без id) ответа нет.
+        """
+        answers = [None] * len(calls)
+        pending = []  # (номер вызова, параметры, ограничение времени)
+        for i, call in enumerate(calls):
+            try:
+                if not isinstance(call, dict) or call.get('jsonrpc') != '2.0' or 'method' not in call:
+                    raise RequestError(INVALID_REQUEST, 'Ожидается объект JSON-RPC 2.0 с полем method')
+                params = call.get('params', {})
+                if call['method'] == 'solve':
+                    pending.append((i, params, timeout_of(params) if isinstance(params, dict) else TIMEOUT))
+                elif call['method'] == 'catalog':
+                    answers[i] = (True, catalog())
+                else:
+                    raise RequestError(METHOD_NOT_FOUND, f'Неизвестный метод {call["method"]!r}, доступны: solve, catalog')
+            except RequestError as e:
+                answers[i] = (False, e.code, e.message)
+
+        size = min(CHUNK_SIZE, max(1, -(-len(pending) // self.workers)))
+        chunks = [pending[start:start + size] for start in range(0, len(pending), size)]
+        futures = [self.pool.submit(solve_chunk, [params for _, params, _ in chunk]) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                outcomes = future.result(timeout=sum(timeout for _, _, timeout in chunk) + TIMEOUT_MARGIN)
+            except FutureTimeoutError:
+                outcomes = [(False, TIMEOUT_ERROR, 'Процесс-исполнитель не ответил вовремя')] * len(chunk)
+            except Exception as e:
+                outcomes = [(False, SOLVE_ERROR, f'Процесс-исполнитель завершился с ошибкой: {e}')] * len(chunk)
+            for (i, _, _), outcome in zip(chunk, outcomes):
+                answers[i] = outcome
+
+        responses = []
+        for call, answer in zip(calls, answers):
+            if isinstance(call, dict) and 'id' not in call:
+                continue  # Уведомление: ответ не отправляется
+            response = {'jsonrpc': '2.0', 'id': call.get('id') if isinstance(call, dict) else None}
+            if answer[0]:
+                response['result'] = answer[1]
+            else:
+                response['error'] = {'code': answer[1], 'message': answer[2]}
+            responses.append(response)
+        return responses
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    """
+    Запросы JSON-RPC 2.0 методом POST: один вызов объектом или пакет вызовов массивом.
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.reply({'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': 'Некорректный JSON'}})
+            return
+
+        if isinstance(payload, list):
+            if not payload:
+                self.reply({'jsonrpc': '2.0', 'id': None,
+                            'error': {'code': INVALID_REQUEST, 'message': 'Пустой пакет вызовов'}})
+                return
+            self.reply(self.server.dispatch(payload) or None)
+        else:
+            responses = self.server.dispatch([payload])
+            self.reply(responses[0] if responses else None)
+
+    def reply(self, response):
+        if response is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+        data = json.dumps(response, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Журнал каждого запроса не ведется
+
+
+def main():
+    """
+    Сервер решения нелинейных уравнений: процессы-исполнители запускаются один раз
+    и обслуживают все запросы, поэтому запуск интерпретатора и импорт библиотек не повторяются.
+    """
+    parser = argparse.ArgumentParser(description='Сервер JSON-RPC для решения нелинейных уравнений.')
+    parser.add_argument('--host', default=HOST, help='адрес сервера')
+    parser.add_argument('-p', '--port', type=int, default=PORT, help='порт сервера')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='число процессов (по умолчанию - число ядер)')
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        server = SolveServer((args.host, args.port), pool, workers)
+        print(f'Сервер запущен на http://{args.host}:{args.port}, процессов: {workers}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
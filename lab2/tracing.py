@@ -0,0 +1,110 @@
+from typing import Sequence
+
+import numpy as np
+
+
+INITIAL_CAPACITY = 64  # Начальный размер буфера записей в памяти
+FILE_BATCH = 1024  # Число записей, накапливаемых перед записью в файл
+
+
+class NullTrace:
+    """
+    Трасса, которая ничего не сохраняет. Методы проверяют enabled перед записью,
+    поэтому в цикле итераций не формируются ни строки, ни кортежи значений.
+    """
+    enabled = False
+
+    def start(self, fields: Sequence[str]):
+        pass
+
+    def record(self, *values):
+        pass
+
+    def close(self):
+        pass
+
+    def render(self) -> str:
+        return ''
+
+
+class MemoryTrace(NullTrace):
+    """
+    Трасса в памяти: по записи (номер итерации и значения полей) на итерацию в массиве float64.
+    Текст формируется только в render, после окончания решения.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.fields = ()
+        self.data = np.empty((0, 0))
+        self.size = 0
+
+    def start(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self.data = np.empty((INITIAL_CAPACITY, len(self.fields) + 1))
+        self.size = 0
+
+    def record(self, *values):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.empty_like(self.data)])
+        self.data[self.size] = values
+        self.size += 1
+
+    def rows(self) -> np.ndarray:
+        """
+        Записи трассы: первый столбец - номер итерации, далее поля в порядке fields.
+        """
+        return self.data[:self.size]
+
+    def render(self) -> str:
+        """
+        Таблица итераций: заголовок с названиями полей и по строке на итерацию.
+        """
+        if not self.size:
+            return ''
+        lines = ['№ | ' + ' | '.join(self.fields)]
+        lines += [f'{int(row[0])} | ' + ' | '.join(f'{value:.6g}' for value in row[1:]) for row in self.rows()]
+        return '\n'.join(lines)
+
+
+class FileTrace(NullTrace):
+    """
+    Трасса в CSV-файле: записи накапливаются в буфере и записываются пачками по FILE_BATCH строк.
+    """
+    enabled = True
+
+    def __init__(self, filename: str, batch: int = FILE_BATCH):
+        self.filename = filename
+        self.batch = batch
+        self.file = None
+        self.buffer = np.empty((0, 0))
+        self.size = 0
+        self.total = 0
+
+    def start(self, fields: Sequence[str]):
+        self.close()
+        self.file = open(self.filename, 'w')
+        self.file.write(','.join(('iteration',) + tuple(fields)) + '\n')
+        self.buffer = np.empty((self.batch, len(fields) + 1))
+        self.size = 0
+        self.total = 0
+
+    def record(self, *values):
+        self.buffer[self.size] = values
+        self.size += 1
+        if self.size == self.batch:
+            self.flush()
+
+    def flush(self):
+        np.savetxt(self.file, self.buffer[:self.size], delimiter=',', fmt='%.17g')
+        self.total += self.size
+        self.size = 0
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def render(self) -> str:
+        return f'Трасса итераций ({self.total} записей) сохранена в файл {self.filename}'
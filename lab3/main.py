@@ -83,17 +83,45 @@ methods = {
     "simpson": simpson_rule
 }
 
+def refinements(func, a, b, n, method):
+    """
+    Значения интеграла при n, 2n, 4n, ... разбиениях.
+    При удвоении n новые узлы - середины прежних отрезков, а в прежних узлах функция заново не вычисляется:
+    для левых и правых прямоугольников и трапеций I_2n = (I_n + M_n) / 2, где M_n - формула средних прямоугольников,
+    формула Симпсона выражается через трапеции: S_2n = (4 * T_2n - T_n) / 3.
+    Узлы средних прямоугольников при удвоении с прежними не совпадают, поэтому каждый уровень считается целиком.
+    """
+    if method == "rectangle_middle":
+        while True:
+            yield n, rectangle_rule(func, a, b, n)
+            n *= 2
+
+    if method == "simpson":
+        trapezoid = trapezoid_rule(func, a, b, n // 2)
+        while True:
+            refined = (trapezoid + rectangle_rule(func, a, b, n // 2)) / 2
+            yield n, (4 * refined - trapezoid) / 3
+            trapezoid = refined
+            n *= 2
+
+    result = methods[method](func, a, b, n)
+    while True:
+        yield n, result
+        result = (result + rectangle_rule(func, a, b, n)) / 2
+        n *= 2
+
+
 def compute_integral(func, a, b, epsilon, method):
     n = 4
     runge_coef = {"rectangle_left": 1, "rectangle_right": 1, "rectangle_middle": 3, "trapezoid": 3, "simpson": 15}
     coef = runge_coef[method]
 
-    result = methods[method](func, a, b, n)
+    levels = refinements(func, a, b, n, method)
+    n, result = next(levels)
     error = math.inf
 
     while error > epsilon:
-        n *= 2
-        new_result = methods[method](func, a, b, n)
+        n, new_result = next(levels)
         error = abs(new_result - result) / coef
 
         result = new_result